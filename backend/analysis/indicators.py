@@ -0,0 +1,196 @@
+"""
+Technical indicator kernels for confluence analysis.
+Computes RSI, MACD, moving averages, Bollinger Bands, Stochastic and volume
+indicators in a single pass over the price arrays, matching the pandas
+rolling/ewm definitions used by the Streamlit app.
+"""
+
+import numpy as np
+
+from ._jit import njit
+
+INDICATOR_NAMES = (
+    'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    'sma_20', 'sma_50', 'ema_20', 'ema_50',
+    'volume_sma', 'volume_ratio', 'vpt',
+    'bb_upper', 'bb_lower', 'bb_middle',
+    'stoch_k', 'stoch_d'
+)
+
+
+@njit(cache=True)
+def _rolling_min_max(low, high, window):
+    """
+    Trailing-window minimum of ``low`` and maximum of ``high`` in one O(n) sweep.
+
+    Each side keeps a monotonic deque of candidate indices: values dominated by
+    a newer bar are popped from the back, and indices that left the window are
+    popped from the front, so the front always holds the window extreme.
+    Entries before the window is full are NaN.
+    """
+    n = low.shape[0]
+    out_min = np.full(n, np.nan)
+    out_max = np.full(n, np.nan)
+    min_idx = np.empty(n, dtype=np.int64)
+    max_idx = np.empty(n, dtype=np.int64)
+    min_head = min_tail = 0
+    max_head = max_tail = 0
+
+    for i in range(n):
+        while min_tail > min_head and low[min_idx[min_tail - 1]] >= low[i]:
+            min_tail -= 1
+        min_idx[min_tail] = i
+        min_tail += 1
+        if min_idx[min_head] <= i - window:
+            min_head += 1
+
+        while max_tail > max_head and high[max_idx[max_tail - 1]] <= high[i]:
+            max_tail -= 1
+        max_idx[max_tail] = i
+        max_tail += 1
+        if max_idx[max_head] <= i - window:
+            max_head += 1
+
+        if i >= window - 1:
+            out_min[i] = low[min_idx[min_head]]
+            out_max[i] = high[max_idx[max_head]]
+
+    return out_min, out_max
+
+
+@njit(cache=True)
+def _compute_all_indicators(close, high, low, volume):
+    """
+    Fused indicator kernel.
+
+    Window statistics are taken over the trailing window at each bar and EMAs
+    use the adjusted (span-weighted) recursion, so results match
+    ``Series.rolling(w).mean()/std()`` and ``Series.ewm(span=s).mean()``.
+    """
+    n = close.shape[0]
+    out = np.full((16, n), np.nan)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    a20 = 2.0 / 21.0
+    a50 = 2.0 / 51.0
+    num12 = num26 = num9 = num20 = num50 = 0.0
+    den12 = den26 = den9 = den20 = den50 = 0.0
+    vpt = 0.0
+    lowest_low, highest_high = _rolling_min_max(low, high, 14)
+
+    for i in range(n):
+        c = close[i]
+
+        # Adjusted EMAs: weighted sums of past values over their weights
+        num12 = c + (1.0 - a12) * num12
+        den12 = 1.0 + (1.0 - a12) * den12
+        num26 = c + (1.0 - a26) * num26
+        den26 = 1.0 + (1.0 - a26) * den26
+        num20 = c + (1.0 - a20) * num20
+        den20 = 1.0 + (1.0 - a20) * den20
+        num50 = c + (1.0 - a50) * num50
+        den50 = 1.0 + (1.0 - a50) * den50
+
+        macd = num12 / den12 - num26 / den26
+        num9 = macd + (1.0 - a9) * num9
+        den9 = 1.0 + (1.0 - a9) * den9
+        out[1, i] = macd
+        out[2, i] = num9 / den9
+        out[3, i] = macd - num9 / den9
+        out[6, i] = num20 / den20
+        out[7, i] = num50 / den50
+
+        # RSI (14): simple means of gains and losses; the first bar has no change
+        if i >= 13:
+            gain = 0.0
+            loss = 0.0
+            for j in range(i - 13, i + 1):
+                if j > 0:
+                    delta = close[j] - close[j - 1]
+                    if delta > 0:
+                        gain += delta
+                    elif delta < 0:
+                        loss -= delta
+            if loss > 0:
+                out[0, i] = 100.0 - 100.0 / (1.0 + gain / loss)
+            elif gain > 0:
+                out[0, i] = 100.0
+
+        # SMA 20 and Bollinger Bands (sample std, 2 deviations)
+        if i >= 19:
+            s = 0.0
+            for j in range(i - 19, i + 1):
+                s += close[j]
+            mean20 = s / 20.0
+            ss = 0.0
+            for j in range(i - 19, i + 1):
+                ss += (close[j] - mean20) ** 2
+            std20 = np.sqrt(ss / 19.0)
+            out[4, i] = mean20
+            out[11, i] = mean20 + 2.0 * std20
+            out[12, i] = mean20 - 2.0 * std20
+            out[13, i] = mean20
+
+        # SMA 50
+        if i >= 49:
+            s = 0.0
+            for j in range(i - 49, i + 1):
+                s += close[j]
+            out[5, i] = s / 50.0
+
+        # Volume SMA 20, volume ratio and volume-price trend
+        if i >= 19:
+            s = 0.0
+            for j in range(i - 19, i + 1):
+                s += volume[j]
+            vol_sma = s / 20.0
+            out[8, i] = vol_sma
+            if vol_sma != 0.0:
+                out[9, i] = volume[i] / vol_sma
+        if i > 0 and close[i - 1] != 0.0:
+            vpt += volume[i] * (c / close[i - 1] - 1.0)
+            out[10, i] = vpt
+
+        # Stochastic %K (14) and %D (3)
+        if i >= 13:
+            lowest = lowest_low[i]
+            highest = highest_high[i]
+            if highest != lowest:
+                out[14, i] = 100.0 * (c - lowest) / (highest - lowest)
+        if i >= 15:
+            out[15, i] = (out[14, i - 2] + out[14, i - 1] + out[14, i]) / 3.0
+
+    return out
+
+
+def compute_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       volume: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """
+    Compute the full indicator set used for confluence analysis.
+
+    Args:
+        close: Close prices
+        high: High prices
+        low: Low prices
+        volume: Optional volumes; volume indicators are omitted without it
+
+    Returns:
+        Dictionary of indicator name to float64 array aligned with the input
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    has_volume = volume is not None
+    if has_volume:
+        volume = np.ascontiguousarray(volume, dtype=np.float64)
+    else:
+        volume = np.zeros_like(close)
+
+    rows = _compute_all_indicators(close, high, low, volume)
+    indicators = dict(zip(INDICATOR_NAMES, rows))
+    if not has_volume:
+        for name in ('volume_sma', 'volume_ratio', 'vpt'):
+            del indicators[name]
+    return indicators
@@ -7,6 +7,95 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict
 
+from ._jit import njit
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def _zigzag_pivots(high, low, pct_threshold):
+    """
+    ZigZag pivot scan over raw high/low arrays.
+
+    Returns pivot indices, prices and a flag that is True for high pivots.
+    Runs without the GIL, so scans on worker threads do not block the script thread.
+    """
+    n = high.shape[0]
+    # At most one pivot per bar plus the seeded first low and the trailing extreme
+    pivot_index = np.empty(n + 1, dtype=np.int64)
+    pivot_price = np.empty(n + 1, dtype=np.float64)
+    pivot_is_high = np.empty(n + 1, dtype=np.bool_)
+    count = 0
+
+    # Find the first significant high or low as starting point
+    trend_up = True
+    found_trend = False
+    current_idx = 0
+    current_price = high[0]
+
+    # Determine initial trend direction from the first 20 bars
+    for i in range(1, min(20, n)):
+        high_change = (high[i] - high[0]) / high[0] * 100
+        low_change = (low[0] - low[i]) / low[0] * 100
+
+        if high_change >= pct_threshold:
+            trend_up = True
+            current_price = low[0]
+            found_trend = True
+            break
+        elif low_change >= pct_threshold:
+            trend_up = False
+            current_price = high[0]
+            found_trend = True
+            break
+
+    if not found_trend:
+        # If no clear trend found, start with first bar as low
+        trend_up = True
+        current_price = low[0]
+        pivot_index[count] = 0
+        pivot_price[count] = low[0]
+        pivot_is_high[count] = False
+        count += 1
+
+    # Scan for pivots
+    for i in range(1, n):
+        if trend_up:
+            # Looking for highs
+            if high[i] > current_price:
+                current_idx = i
+                current_price = high[i]
+            elif (current_price - low[i]) / current_price * 100 >= pct_threshold:
+                # Significant move down from the high: record it and look for lows
+                pivot_index[count] = current_idx
+                pivot_price[count] = current_price
+                pivot_is_high[count] = True
+                count += 1
+                trend_up = False
+                current_idx = i
+                current_price = low[i]
+        else:
+            # Looking for lows
+            if low[i] < current_price:
+                current_idx = i
+                current_price = low[i]
+            elif (high[i] - current_price) / current_price * 100 >= pct_threshold:
+                # Significant move up from the low: record it and look for highs
+                pivot_index[count] = current_idx
+                pivot_price[count] = current_price
+                pivot_is_high[count] = False
+                count += 1
+                trend_up = True
+                current_idx = i
+                current_price = high[i]
+
+    # Add the final pivot if we ended on an extreme
+    if count == 0 or pivot_index[count - 1] != current_idx:
+        pivot_index[count] = current_idx
+        pivot_price[count] = current_price
+        pivot_is_high[count] = trend_up
+        count += 1
+
+    return pivot_index[:count], pivot_price[:count], pivot_is_high[:count]
+
 
 def detect_zigzag(df: pd.DataFrame, pct_threshold: float = 4.0) -> List[Dict]:
     """
@@ -22,99 +111,38 @@ def detect_zigzag(df: pd.DataFrame, pct_threshold: float = 4.0) -> List[Dict]:
     if len(df) < 3:
         return []
     
-    high_col = df['high'].values
-    low_col = df['low'].values
-    
-    pivots = []
+    high_col = np.ascontiguousarray(df['high'].values, dtype=np.float64)
+    low_col = np.ascontiguousarray(df['low'].values, dtype=np.float64)
     
-    # Find the first significant high or low as starting point
-    start_idx = 0
-    current_trend = None  # Will be 'up' or 'down'
-    current_pivot_idx = 0
-    current_pivot_price = high_col[0]
-    
-    # Determine initial trend direction
-    for i in range(1, min(20, len(df))):  # Look at first 20 bars
-        high_change = (high_col[i] - high_col[current_pivot_idx]) / high_col[current_pivot_idx] * 100
-        low_change = (low_col[current_pivot_idx] - low_col[i]) / low_col[current_pivot_idx] * 100
-        
-        if high_change >= pct_threshold:
-            current_trend = 'up'
-            current_pivot_idx = 0
-            current_pivot_price = low_col[0]
-            break
-        elif low_change >= pct_threshold:
-            current_trend = 'down'
-            current_pivot_idx = 0
-            current_pivot_price = high_col[0]
-            break
+    pivot_index, pivot_price, pivot_is_high = _zigzag_pivots(high_col, low_col, float(pct_threshold))
     
-    if current_trend is None:
-        # If no clear trend found, start with first bar as low
-        current_trend = 'up'
-        current_pivot_idx = 0
-        current_pivot_price = low_col[0]
-        pivots.append({
-            'index': 0,
-            'price': low_col[0],
-            'direction': 'low'
-        })
+    return [
+        {
+            'index': index,
+            'price': price,
+            'direction': 'high' if is_high else 'low'
+        }
+        for index, price, is_high in zip(pivot_index.tolist(), pivot_price, pivot_is_high.tolist())
+    ]
+
+
+def count_zigzag_pivots(df: pd.DataFrame, pct_threshold: float = 4.0) -> int:
+    """
+    Count the pivots detect_zigzag would return, without building pivot dictionaries.
     
-    # Scan for pivots
-    i = 1
-    while i < len(df):
-        if current_trend == 'up':
-            # Looking for highs
-            if high_col[i] > current_pivot_price:
-                current_pivot_idx = i
-                current_pivot_price = high_col[i]
-            else:
-                # Check for reversal (significant move down from high)
-                decline_pct = (current_pivot_price - low_col[i]) / current_pivot_price * 100
-                if decline_pct >= pct_threshold:
-                    # Found a high pivot
-                    pivots.append({
-                        'index': current_pivot_idx,
-                        'price': current_pivot_price,
-                        'direction': 'high'
-                    })
-                    # Switch to looking for lows
-                    current_trend = 'down'
-                    current_pivot_idx = i
-                    current_pivot_price = low_col[i]
-        
-        else:  # current_trend == 'down'
-            # Looking for lows
-            if low_col[i] < current_pivot_price:
-                current_pivot_idx = i
-                current_pivot_price = low_col[i]
-            else:
-                # Check for reversal (significant move up from low)
-                rally_pct = (high_col[i] - current_pivot_price) / current_pivot_price * 100
-                if rally_pct >= pct_threshold:
-                    # Found a low pivot
-                    pivots.append({
-                        'index': current_pivot_idx,
-                        'price': current_pivot_price,
-                        'direction': 'low'
-                    })
-                    # Switch to looking for highs
-                    current_trend = 'up'
-                    current_pivot_idx = i
-                    current_pivot_price = high_col[i]
+    Args:
+        df: DataFrame with OHLCV data
+        pct_threshold: Minimum percentage move to qualify as a pivot
         
-        i += 1
+    Returns:
+        Number of detected pivots
+    """
+    if len(df) < 3:
+        return 0
     
-    # Add the final pivot if we ended on an extreme
-    if len(pivots) == 0 or pivots[-1]['index'] != current_pivot_idx:
-        direction = 'high' if current_trend == 'up' else 'low'
-        pivots.append({
-            'index': current_pivot_idx,
-            'price': current_pivot_price,
-            'direction': direction
-        })
-    
-    return pivots
+    high_col = np.ascontiguousarray(df['high'].values, dtype=np.float64)
+    low_col = np.ascontiguousarray(df['low'].values, dtype=np.float64)
+    return len(_zigzag_pivots(high_col, low_col, float(pct_threshold))[0])
 
 
 def validate_zigzag(df: pd.DataFrame, pivots: List[Dict], min_move_pct: float = 1.0) -> List[Dict]:
@@ -0,0 +1,101 @@
+"""
+Unit tests for the fused technical indicator kernel.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.indicators import INDICATOR_NAMES, _rolling_min_max, compute_indicators
+
+
+def make_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    """Create a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+        'volume': rng.integers(1000, 5000, n).astype(float)
+    })
+
+
+def pandas_reference(df: pd.DataFrame) -> dict:
+    """Indicator definitions using pandas rolling/ewm."""
+    close = df['close']
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    signal = macd.ewm(span=9).mean()
+    sma_20 = close.rolling(window=20).mean()
+    std_20 = close.rolling(window=20).std()
+    lowest_low = df['low'].rolling(window=14).min()
+    highest_high = df['high'].rolling(window=14).max()
+    stoch_k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    volume_sma = df['volume'].rolling(window=20).mean()
+    return {
+        'rsi': 100 - (100 / (1 + gain / loss)),
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_histogram': macd - signal,
+        'sma_20': sma_20,
+        'sma_50': close.rolling(window=50).mean(),
+        'ema_20': close.ewm(span=20).mean(),
+        'ema_50': close.ewm(span=50).mean(),
+        'volume_sma': volume_sma,
+        'volume_ratio': df['volume'] / volume_sma,
+        'vpt': (df['volume'] * close.pct_change()).cumsum(),
+        'bb_upper': sma_20 + std_20 * 2,
+        'bb_lower': sma_20 - std_20 * 2,
+        'bb_middle': sma_20,
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_k.rolling(window=3).mean()
+    }
+
+
+class TestComputeIndicators:
+    """Test the fused indicator kernel against pandas definitions."""
+
+    @pytest.mark.parametrize("n", [20, 49, 50, 250])
+    def test_matches_pandas_reference(self, n):
+        """Every indicator should match the pandas rolling/ewm result."""
+        df = make_ohlcv(n, seed=n)
+        result = compute_indicators(df['close'].values, df['high'].values,
+                                    df['low'].values, df['volume'].values)
+        expected = pandas_reference(df)
+
+        assert list(result.keys()) == list(INDICATOR_NAMES)
+        for name, values in expected.items():
+            np.testing.assert_allclose(result[name], values.to_numpy(), rtol=1e-9,
+                                       equal_nan=True, err_msg=name)
+
+    def test_without_volume(self):
+        """Volume indicators are omitted when no volume is supplied."""
+        df = make_ohlcv(60)
+        result = compute_indicators(df['close'].values, df['high'].values, df['low'].values)
+
+        assert 'volume_ratio' not in result
+        assert 'vpt' not in result
+        assert len(result['rsi']) == 60
+
+    def test_rsi_bounds_on_trending_series(self):
+        """A strictly rising series has RSI pinned at 100."""
+        close = np.arange(1.0, 41.0)
+        result = compute_indicators(close, close + 0.5, close - 0.5)
+
+        assert np.isnan(result['rsi'][12])
+        assert np.all(result['rsi'][13:] == 100.0)
+
+    @pytest.mark.parametrize("window", [1, 3, 14, 40])
+    def test_rolling_min_max_matches_pandas(self, window):
+        """The deque-based rolling extremes match pandas rolling min/max."""
+        df = make_ohlcv(120, seed=window)
+        # Repeated values exercise the tie handling in the deques
+        df.loc[30:45, 'low'] = df['low'].iloc[30]
+        df.loc[60:70, 'high'] = df['high'].iloc[60]
+        lowest, highest = _rolling_min_max(df['low'].values, df['high'].values, window)
+
+        np.testing.assert_array_equal(lowest, df['low'].rolling(window=window).min().to_numpy())
+        np.testing.assert_array_equal(highest, df['high'].rolling(window=window).max().to_numpy())
@@ -0,0 +1,72 @@
+"""
+Tests for the price-frame cache keys used by the Streamlit app's cached analysis.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+
+# The Streamlit app lives at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import streamlit_app
+
+
+def make_frame(n: int = 300, seed: int = 3) -> pd.DataFrame:
+    """Create a random-walk OHLCV frame in the app's fetch_stock_data schema."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2023-01-01', periods=n, freq='D').strftime('%Y-%m-%d %H:%M:%S'),
+        'open': close + rng.normal(0, 0.3, n),
+        'high': close + rng.random(n),
+        'low': close - rng.random(n),
+        'close': close,
+        'volume': rng.integers(1000, 5000, n).astype(float)
+    })
+
+
+class TestPriceFrameCache:
+    """Cached analysis must not be shared between frames with different bars."""
+
+    def test_key_covers_every_column(self):
+        """Changing a single high, low or volume value changes the key."""
+        df = make_frame()
+        key = streamlit_app._price_frame_key(df)
+
+        for column in ('high', 'low', 'volume'):
+            changed = df.copy()
+            changed.loc[150, column] *= 1.01
+            assert streamlit_app._price_frame_key(changed) != key, column
+
+        assert streamlit_app._price_frame_key(df.copy()) == key
+
+    def test_wave_analysis_differs_by_high(self):
+        """Frames with identical closes but different highs get their own pivots."""
+        df = make_frame()
+        spiked = df.copy()
+        spiked.loc[150, 'high'] = df['close'].max() * 1.3
+
+        original = streamlit_app.analyze_elliott_waves(df, 4.0)
+        result = streamlit_app.analyze_elliott_waves(spiked, 4.0)
+
+        assert result['zigzag_pivots'] != original['zigzag_pivots']
+        assert result['zigzag_pivots'] == streamlit_app.analyze_elliott_waves.__wrapped__(spiked, 4.0)['zigzag_pivots']
+
+    @pytest.mark.parametrize("column, indicator", [('high', 'stoch_k'), ('volume', 'volume_ratio')])
+    def test_indicators_differ_by_column(self, column, indicator):
+        """Indicators reading highs or volume are recomputed when only that column changes."""
+        df = make_frame()
+        changed = df.copy()
+        changed.loc[len(df) - 1, column] *= 1.5
+
+        original = streamlit_app.calculate_technical_indicators(df)
+        result = streamlit_app.calculate_technical_indicators(changed)
+        expected = streamlit_app.calculate_technical_indicators.__wrapped__(changed)
+
+        assert not np.array_equal(result[indicator], original[indicator], equal_nan=True)
+        np.testing.assert_array_equal(result[indicator], expected[indicator])
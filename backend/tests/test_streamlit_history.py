@@ -0,0 +1,112 @@
+"""
+Tests for the Streamlit app's price history downloads with a stubbed yfinance-cache.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+
+# The Streamlit app lives at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import streamlit_app
+
+
+def make_history(n: int = 30, freq: str = 'D', index_name=None) -> pd.DataFrame:
+    """Create a yfinance-style history frame indexed by timestamp."""
+    rng = np.random.default_rng(n)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    index = pd.date_range('2024-01-01', periods=n, freq=freq, tz='America/New_York', name=index_name)
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, n),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    }, index=index)
+
+
+class StubTicker:
+    """Ticker stand-in returning a fixed frame or raising a fixed error."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def history(self, period, interval='1d'):
+        self.calls.append((period, interval))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture
+def stub_sources(monkeypatch):
+    """Route yfinance-cache and yfinance Ticker lookups to stubs set by each test."""
+    sources = {}
+
+    class StubModule:
+        @staticmethod
+        def Ticker(symbol):
+            return sources['yfc']
+
+    monkeypatch.setattr(streamlit_app, 'yfc', StubModule)
+    monkeypatch.setattr(streamlit_app.yf, 'Ticker', lambda symbol: sources['yf'])
+    return sources
+
+
+class TestFetchHistory:
+    """yfinance-cache frames are normalized, and anything unusable falls back to yfinance."""
+
+    @pytest.mark.parametrize("interval, freq, index_name", [('1d', 'D', None), ('1h', 'h', 'Date')])
+    def test_cached_frame_is_normalized(self, stub_sources, interval, freq, index_name):
+        """Bookkeeping columns are dropped and the index is named like yfinance's."""
+        cached = make_history(freq=freq, index_name=index_name)
+        cached['FetchDate'] = pd.Timestamp('2024-03-01')
+        cached['Final?'] = True
+        stub_sources['yfc'] = StubTicker(cached)
+        stub_sources['yf'] = StubTicker(AssertionError('yfinance should not be called'))
+
+        hist = streamlit_app.fetch_history('AAA', '1mo', interval)
+
+        assert list(hist.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert hist.index.name == ('Date' if interval == '1d' else 'Datetime')
+        pd.testing.assert_series_equal(hist['Close'], cached['Close'].rename_axis(hist.index.name))
+
+    @pytest.mark.parametrize("cached", [
+        RuntimeError('cache failure'),
+        pd.DataFrame(),
+        make_history().drop(columns=['Volume']),
+        make_history().reset_index()
+    ])
+    def test_falls_back_to_yfinance(self, stub_sources, cached):
+        """Errors, empty frames and frames without OHLCV bars use a direct download."""
+        direct = make_history(index_name='Date')
+        stub_sources['yfc'] = StubTicker(cached)
+        stub_sources['yf'] = StubTicker(direct)
+
+        hist = streamlit_app.fetch_history('AAA', '1mo')
+
+        assert hist is direct
+        assert stub_sources['yf'].calls == [('1mo', '1d')]
+
+    def test_fetch_stock_data_reads_cached_frame(self, stub_sources, monkeypatch):
+        """fetch_stock_data maps a normalized yfinance-cache frame onto the app schema."""
+        cached = make_history(n=24, freq='h')
+        cached['FetchDate'] = pd.Timestamp('2024-03-01')
+        stub_sources['yfc'] = StubTicker(cached)
+        stub_sources['yf'] = StubTicker(AssertionError('yfinance should not be called'))
+        monkeypatch.setattr(streamlit_app, 'get_cached_data', lambda key: None)
+        monkeypatch.setattr(streamlit_app, 'cache_data', lambda key, data: None)
+
+        df = streamlit_app.fetch_stock_data.__wrapped__('AAA', '1h', '1mo')
+
+        assert list(df.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        assert len(df) == 24
+        assert df['timestamp'].iloc[1] == '2024-01-01 01:00:00'
@@ -5,7 +5,7 @@ Unit tests for ZigZag pivot detection algorithm.
 import pytest
 import pandas as pd
 import numpy as np
-from analysis.zigzag import detect_zigzag, validate_zigzag, calculate_pivot_strength
+from analysis.zigzag import detect_zigzag, validate_zigzag, calculate_pivot_strength, count_zigzag_pivots
 
 
 class TestZigZagDetection:
@@ -161,6 +161,34 @@ class TestZigZagDetection:
             else:
                 assert abs(pivot['price'] - df.iloc[pivot['index']]['low']) < 0.01
 
+    def test_known_swing_pivots(self):
+        """Test the exact pivots found on a hand-checked swing series."""
+        data = {
+            'high': [100, 104, 110, 106, 101, 97, 99, 104, 108, 103],
+            'low':  [98, 102, 107, 103, 98, 94, 97, 101, 105, 99],
+            'volume': [1000] * 10
+        }
+        df = pd.DataFrame(data)
+        
+        pivots = detect_zigzag(df, pct_threshold=3.0)
+        
+        assert [(p['index'], p['price'], p['direction']) for p in pivots] == [
+            (2, 110.0, 'high'),
+            (5, 94.0, 'low'),
+            (8, 108.0, 'high'),
+            (9, 99.0, 'low')
+        ]
+    
+    def test_count_matches_detection(self):
+        """Test that the pivot count agrees with detect_zigzag."""
+        np.random.seed(7)
+        prices = 100 + np.cumsum(np.random.randn(200))
+        df = pd.DataFrame({'high': prices + 0.5, 'low': prices - 0.5})
+        
+        for threshold in [1.0, 3.0, 8.0]:
+            assert count_zigzag_pivots(df, threshold) == len(detect_zigzag(df, threshold))
+        assert count_zigzag_pivots(df.head(2)) == 0
+
 
 if __name__ == "__main__":
     # Run tests if executed directly
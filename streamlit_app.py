@@ -2,22 +2,43 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import yfinance as yf
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import sqlite3
 import json
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timedelta
 import hashlib
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    import yfinance_cache as yfc
+except ImportError:
+    yfc = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add the backend directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 try:
-    from backend.analysis.zigzag import detect_zigzag, validate_zigzag
+    from backend.analysis.zigzag import detect_zigzag, validate_zigzag, count_zigzag_pivots
     from backend.analysis.waves import analyze_waves, calculate_invalidation_levels  
     from backend.analysis.fib import calculate_fibonacci_levels
+    from backend.analysis.indicators import compute_indicators
+    from backend.analysis._jit import NUMBA_AVAILABLE
 except ImportError:
     st.error("❌ Could not import analysis modules. Please ensure the backend directory exists.")
     st.stop()
@@ -257,10 +278,15 @@ if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
 if 'price_data' not in st.session_state:
     st.session_state.price_data = None
+if 'analysis_key' not in st.session_state:
+    st.session_state.analysis_key = None
 
 # Database setup
 DB_PATH = "streamlit_cache.db"
 
+# Show the raw analysis debug panel (set EW_DEBUG=1 when developing)
+DEBUG_PANEL = bool(os.getenv('EW_DEBUG'))
+
 @st.cache_resource
 def init_db():
     """Initialize SQLite database for caching"""
@@ -313,7 +339,35 @@ def cache_data(cache_key: str, data: dict):
     conn.commit()
     conn.close()
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+# Columns every history frame must carry, in yfinance's history() layout
+_HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def as_yfinance_history(hist, interval):
+    """Reshape a yfinance-cache frame into yfinance's history() layout; None when it lacks OHLCV bars"""
+    if (not isinstance(hist, pd.DataFrame) or hist.empty or not isinstance(hist.index, pd.DatetimeIndex)
+            or not set(_HISTORY_COLUMNS).issubset(hist.columns)):
+        return None
+    
+    # yfinance-cache adds bookkeeping columns and names its index differently
+    hist = hist[_HISTORY_COLUMNS].copy()
+    hist.index.name = 'Date' if interval.endswith(('d', 'wk', 'mo')) else 'Datetime'
+    return hist
+
+def fetch_history(symbol: str, period: str, interval: str = "1d"):
+    """Yahoo price history, served from the yfinance-cache disk store when it is installed"""
+    if yfc is not None:
+        try:
+            hist = as_yfinance_history(yfc.Ticker(symbol).history(period=period, interval=interval), interval)
+        except Exception:
+            hist = None
+        if hist is not None:
+            return hist
+        # Fall back to a direct yfinance download on errors or unexpected frames
+    # A fresh Ticker per call: concurrent downloads of one symbol must not share its history metadata
+    return yf.Ticker(symbol).history(period=period, interval=interval)
+
+# Cache for 1 hour; callers show their own spinner or progress bar, and the entry cap bounds large scans
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
 def fetch_stock_data(ticker: str, timeframe: str, range_period: str):
     """Fetch stock data with caching"""
     cache_key = generate_cache_key(ticker, timeframe, range_period)
@@ -341,8 +395,7 @@ def fetch_stock_data(ticker: str, timeframe: str, range_period: str):
         interval = interval_map.get(timeframe, "1d")
         
         # Fetch data from Yahoo Finance
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=range_period, interval=interval)
+        hist = fetch_history(ticker, range_period, interval)
         
         if hist.empty:
             st.error(f"No data found for ticker {ticker}")
@@ -384,19 +437,43 @@ def fetch_stock_data(ticker: str, timeframe: str, range_period: str):
         st.error(f"Error fetching data for {ticker}: {str(e)}")
         return pd.DataFrame()
 
+# Candles beyond this are merged into wider bars before plotting; the browser cannot show more than this usefully
+CHART_MAX_CANDLES = 2000
+
+def downsample_ohlc(df: pd.DataFrame, max_candles: int = CHART_MAX_CANDLES):
+    """Merge consecutive bars into at most max_candles OHLC candles (first open, max high, min low, last close)"""
+    n = len(df)
+    if n <= max_candles:
+        return df
+    
+    bucket = -(-n // max_candles)
+    starts = np.arange(0, n, bucket)
+    ends = np.minimum(starts + bucket, n) - 1
+    return pd.DataFrame({
+        'timestamp': df['timestamp'].to_numpy()[starts],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts)
+    })
+
 def create_candlestick_chart(df: pd.DataFrame, analysis_results=None):
     """Create interactive candlestick chart with Elliott Wave overlays"""
+    # Plotly is only needed once a chart is drawn; keep it off the cold-start import path
+    import plotly.graph_objects as go
     
     # Create candlestick chart
     fig = go.Figure()
     
-    # Add candlestick
+    # Add candlestick; long histories are drawn as merged candles, overlays keep exact pivot prices
+    candles = downsample_ohlc(df)
     fig.add_trace(go.Candlestick(
-        x=df['timestamp'],
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
+        x=candles['timestamp'],
+        open=candles['open'],
+        high=candles['high'],
+        low=candles['low'],
+        close=candles['close'],
         name="📊 Price Candles",
         increasing_line_color='#00ff88',
         decreasing_line_color='#ff4444'
@@ -558,6 +635,15 @@ def create_candlestick_chart(df: pd.DataFrame, analysis_results=None):
     
     return fig
 
+def _price_frame_key(df):
+    """Cache key for a price DataFrame: its columns and an ordered digest of every row"""
+    # Hashing every column keeps frames that differ only in wicks or volume apart; the index
+    # is included when the bars are keyed by it rather than by a timestamp column
+    row_hashes = pd.util.hash_pandas_object(df, index='timestamp' not in df.columns)
+    digest = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16).hexdigest()
+    return (len(df), tuple(df.columns), digest)
+
+@st.cache_data(hash_funcs={pd.DataFrame: _price_frame_key}, max_entries=64)
 def analyze_elliott_waves(df: pd.DataFrame, zigzag_threshold: float):
     """Perform Elliott Wave analysis"""
     
@@ -592,21 +678,19 @@ def analyze_elliott_waves(df: pd.DataFrame, zigzag_threshold: float):
         else:
             invalidation_levels = {}
         
-        # Format pivots for JSON serialization
-        formatted_pivots = []
-        for pivot in validated_pivots:
-            # Get timestamp from the dataframe using the index
-            pivot_timestamp = df_analysis.iloc[pivot['index']]['timestamp']
-            formatted_pivots.append({
-                'timestamp': pivot_timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                'price': float(pivot['price']),
-                'type': pivot['direction']  # 'high' or 'low'
-            })
+        # Gather pivot columns in one pass, then format pivots for JSON serialization
+        count = len(validated_pivots)
+        pivot_index = np.fromiter((pivot['index'] for pivot in validated_pivots), dtype=np.int64, count=count)
+        pivot_columns = PivotSoA(
+            price=np.fromiter((pivot['price'] for pivot in validated_pivots), dtype=np.float64, count=count),
+            timestamp=df_analysis['timestamp'].iloc[pivot_index].dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object),
+            kind=np.array([pivot['direction'] for pivot in validated_pivots], dtype=object)  # 'high' or 'low'
+        )
         
         return {
-            'zigzag_pivots': formatted_pivots,
-            'primary_count': wave_analysis.get('primary_count', {}).__dict__ if hasattr(wave_analysis.get('primary_count', {}), '__dict__') else wave_analysis.get('primary_count', {}),
-            'alternate_count': wave_analysis.get('alternate_count', {}).__dict__ if hasattr(wave_analysis.get('alternate_count', {}), '__dict__') else wave_analysis.get('alternate_count', {}),
+            'zigzag_pivots': pivot_columns.to_records(),
+            'primary_count': _as_dict(wave_analysis.get('primary_count')),
+            'alternate_count': _as_dict(wave_analysis.get('alternate_count')),
             'fibonacci_levels': fibonacci_levels,
             'invalidation_levels': invalidation_levels,
             'summary': generate_analysis_summary(wave_analysis, invalidation_levels)
@@ -616,18 +700,74 @@ def analyze_elliott_waves(df: pd.DataFrame, zigzag_threshold: float):
         st.error(f"Error during Elliott Wave analysis: {str(e)}")
         return None
 
+def _as_dict(obj):
+    """Normalize a wave count (dict, dataclass or None) to a plain dict"""
+    if not obj:
+        return {}
+    return obj if isinstance(obj, dict) else obj.__dict__
+
+def current_wave_label(count):
+    """Label of the latest wave in a count: its current_wave, else its last wave label, else 'Unknown'"""
+    count = _as_dict(count)
+    if count.get('current_wave'):
+        return str(count['current_wave'])
+    labels = count.get('labels')
+    if not labels:
+        return 'Unknown'
+    last_label = labels[-1]
+    if isinstance(last_label, dict):
+        return str(last_label.get('wave', 'Unknown'))
+    return str(getattr(last_label, 'wave', last_label))
+
+@lru_cache(maxsize=None)
+def humanize_key(name):
+    """Display title for a snake_case key (e.g. 'wave_integrity' -> 'Wave Integrity')"""
+    return name.replace('_', ' ').title()
+
+@dataclass(frozen=True)
+class PivotSoA:
+    """Pivot points stored column-wise (price, timestamp, type arrays)"""
+    price: np.ndarray
+    timestamp: np.ndarray
+    kind: np.ndarray
+    
+    @classmethod
+    def from_records(cls, pivots):
+        """Build from the list-of-dicts pivots returned by analyze_elliott_waves"""
+        return cls(
+            price=np.fromiter((p['price'] for p in pivots), dtype=np.float64, count=len(pivots)),
+            timestamp=np.array([p.get('timestamp') for p in pivots], dtype=object),
+            kind=np.array([p.get('type') for p in pivots], dtype=object)
+        )
+    
+    @classmethod
+    def coerce(cls, pivots):
+        """Return pivots as a PivotSoA, converting from records if needed"""
+        return pivots if isinstance(pivots, cls) else cls.from_records(pivots)
+    
+    def to_records(self):
+        """Convert back to the list-of-dicts pivot layout"""
+        return [
+            {'timestamp': ts, 'price': price, 'type': kind}
+            for ts, price, kind in zip(self.timestamp.tolist(), self.price.tolist(), self.kind.tolist())
+        ]
+    
+    def __len__(self):
+        return len(self.price)
+
 def generate_analysis_summary(wave_analysis, invalidation_levels):
     """Generate comprehensive human-readable analysis summary with detailed insights"""
     
-    primary = wave_analysis.get('primary_count')
-    alternate = wave_analysis.get('alternate_count')
+    primary = _as_dict(wave_analysis.get('primary_count'))
+    alternate = _as_dict(wave_analysis.get('alternate_count'))
     
     summary = "# 📊 Elliott Wave Analysis Report\n\n"
     
     # Primary Count Analysis
     if primary:
-        primary_score = getattr(primary, 'confidence_score', 0) if hasattr(primary, 'confidence_score') else primary.get('confidence_score', 0)
-        primary_pattern = getattr(primary, 'pattern_type', 'Unknown') if hasattr(primary, 'pattern_type') else primary.get('pattern_type', 'Unknown')
+        primary_score = primary.get('confidence_score', 0)
+        primary_pattern = primary.get('pattern_type', 'Unknown')
+        pattern_lower = primary_pattern.lower()
         
         summary += f"## 🎯 Primary Wave Count\n"
         summary += f"**Confidence Score:** {primary_score:.1f}/100\n"
@@ -644,16 +784,16 @@ def generate_analysis_summary(wave_analysis, invalidation_levels):
             summary += "🔴 **Low Confidence** - Weak structure, consider alternate interpretations\n"
         
         summary += f"\n**Pattern Interpretation:**\n"
-        if "impulse" in primary_pattern.lower():
+        if "impulse" in pattern_lower:
             summary += "- This is an **impulse wave** pattern (5 waves in the direction of the main trend)\n"
             summary += "- Waves 1, 3, 5 move in the trend direction; waves 2, 4 are corrections\n"
             summary += "- Wave 3 is typically the strongest and longest wave\n"
             summary += "- After completion, expect a 3-wave correction (A-B-C)\n"
-        elif "corrective" in primary_pattern.lower():
+        elif "corrective" in pattern_lower:
             summary += "- This is a **corrective wave** pattern (3 waves against the main trend)\n"
             summary += "- Waves A and C move against the trend; wave B is a counter-correction\n"
             summary += "- After completion, expect resumption of the main trend\n"
-        elif "diagonal" in primary_pattern.lower():
+        elif "diagonal" in pattern_lower:
             summary += "- This is a **diagonal pattern** (wedge-like structure)\n"
             summary += "- Often appears in wave 5 or wave C positions\n"
             summary += "- Signals potential trend exhaustion and reversal\n"
@@ -662,8 +802,8 @@ def generate_analysis_summary(wave_analysis, invalidation_levels):
     
     # Alternate Count Analysis
     if alternate and alternate.get('confidence_score', 0) > 30:
-        alternate_score = getattr(alternate, 'confidence_score', 0) if hasattr(alternate, 'confidence_score') else alternate.get('confidence_score', 0)
-        alternate_pattern = getattr(alternate, 'pattern_type', 'Unknown') if hasattr(alternate, 'pattern_type') else alternate.get('pattern_type', 'Unknown')
+        alternate_score = alternate.get('confidence_score', 0)
+        alternate_pattern = alternate.get('pattern_type', 'Unknown')
         
         summary += f"## 🔄 Alternate Wave Count\n"
         summary += f"**Confidence Score:** {alternate_score:.1f}/100\n"
@@ -697,14 +837,12 @@ def generate_analysis_summary(wave_analysis, invalidation_levels):
     summary += f"## 📈 Trading Implications\n"
     
     if primary:
-        primary_pattern = getattr(primary, 'pattern_type', 'Unknown') if hasattr(primary, 'pattern_type') else primary.get('pattern_type', 'Unknown')
-        
-        if "impulse" in primary_pattern.lower():
+        if "impulse" in pattern_lower:
             summary += f"**For Impulse Patterns:**\n"
             summary += f"- Look for buying opportunities on wave 2 and 4 corrections\n"
             summary += f"- Wave 3 typically offers the strongest trending moves\n"
             summary += f"- Wave 5 may show divergence and signal trend exhaustion\n"
-        elif "corrective" in primary_pattern.lower():
+        elif "corrective" in pattern_lower:
             summary += f"**For Corrective Patterns:**\n"
             summary += f"- Counter-trend movements, trade with caution\n"
             summary += f"- Look for reversal signals at completion of wave C\n"
@@ -743,10 +881,35 @@ def generate_analysis_summary(wave_analysis, invalidation_levels):
     
     return summary
 
+# Wave position descriptions used by generate_chart_summary
+_IMPULSE_13_CTX = {
+    "1": "the initial impulse wave, often unnoticed by the broader market",
+    "3": "the strongest trending wave, typically with high volume and momentum",
+    "5": "the final impulse wave, often showing momentum divergence"
+}
+
+_IMPULSE_24_CTX = {
+    "2": "a corrective pullback after the initial impulse, often retracing 50-78.6%",
+    "4": "a sideways or shallow correction, typically alternating with wave 2's structure"
+}
+
+_CORRECTIVE_AC_CTX = {
+    "A": "the initial corrective decline, breaking the previous trend",
+    "C": "the final corrective wave, often targeting Fibonacci extensions"
+}
+
+_IMPULSE_TRADING_ADVICE = {
+    "2": "**Trading Opportunity**: Corrections offer potential entry points for trend continuation - watch for reversal signals at Fibonacci levels.",
+    "4": "**Trading Opportunity**: Corrections offer potential entry points for trend continuation - watch for reversal signals at Fibonacci levels.",
+    "5": "**Trading Caution**: Final wave territory - monitor for completion signals and potential reversal patterns.",
+    "1": "**Trading Context**: Strong trending phase - align positions with primary direction and use pullbacks for entries.",
+    "3": "**Trading Context**: Strong trending phase - align positions with primary direction and use pullbacks for entries."
+}
+
 def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_count_labels=None):
     """Generate a concise paragraph summarizing the Elliott Wave analysis for display next to chart"""
     
-    primary = wave_analysis.get('primary_count')
+    primary = _as_dict(wave_analysis.get('primary_count'))
     pivots = wave_analysis.get('zigzag_pivots', []) if isinstance(wave_analysis, dict) else []
     
     # Check if we have any analysis data at all
@@ -754,7 +917,7 @@ def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_c
         return f"⚠️ **Analysis Status**: No clear Elliott Wave patterns detected for **{ticker}**. This could indicate sideways/consolidating price action or insufficient pivot points. Try adjusting the ZigZag threshold (lower for more sensitivity, higher for major moves only) or selecting a different timeframe for clearer trend structure."
     
     # If we have pivots but weak wave analysis
-    if len(pivots) > 0 and (not primary or getattr(primary, 'confidence_score', 0) < 30):
+    if len(pivots) > 0 and (not primary or primary.get('confidence_score', 0) < 30):
         # Use same trend logic as price targets for consistency
         trend_direction = determine_wave_trend_direction(pivots)
         pivot_count = len(pivots)
@@ -763,15 +926,17 @@ def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_c
         return f"📊 **{ticker} Market Structure Analysis**: Detected **{pivot_count} pivot points** showing {trend_desc} market structure. While no definitive Elliott Wave pattern emerges (confidence too low), the price action suggests {'continued momentum' if 'trend' in trend_direction else 'consolidation or complex correction'}. **Recommendation**: Monitor for clearer pattern development or adjust ZigZag sensitivity. Current structure may be in early wave formation or complex corrective phase requiring more price development for proper classification."
     
     # Standard analysis when we have good primary count
-    primary_score = getattr(primary, 'confidence_score', 0) if hasattr(primary, 'confidence_score') else primary.get('confidence_score', 0)
-    primary_pattern = getattr(primary, 'pattern_type', 'Unknown') if hasattr(primary, 'pattern_type') else primary.get('pattern_type', 'Unknown')
+    primary_score = primary.get('confidence_score', 0)
+    primary_pattern = primary.get('pattern_type', 'Unknown')
+    pattern_lower = primary_pattern.lower()
     
     # Determine current wave position from labels
     current_wave = "unknown"
     if primary_count_labels and len(primary_count_labels) > 0:
         current_wave = str(primary_count_labels[-1])
-    elif hasattr(primary, 'labels') and len(primary.labels) > 0:
-        current_wave = str(primary.labels[-1].wave) if hasattr(primary.labels[-1], 'wave') else str(primary.labels[-1])
+    elif primary.get('labels'):
+        last_label = primary['labels'][-1]
+        current_wave = str(last_label.wave) if hasattr(last_label, 'wave') else str(last_label)
     
     # Build the summary paragraph
     summary = f"**📈 {ticker} Elliott Wave Analysis:** "
@@ -804,34 +969,21 @@ def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_c
     summary += trend_context
     
     # Pattern interpretation with more detail
-    if "impulse" in primary_pattern.lower():
-        if current_wave in ["1", "3", "5"]:
-            wave_context = {
-                "1": "the initial impulse wave, often unnoticed by the broader market",
-                "3": "the strongest trending wave, typically with high volume and momentum", 
-                "5": "the final impulse wave, often showing momentum divergence"
-            }
-            summary += f"Currently positioned in **Wave {current_wave}** ({wave_context.get(current_wave, 'an impulse wave')}). "
-        elif current_wave in ["2", "4"]:
-            wave_context = {
-                "2": "a corrective pullback after the initial impulse, often retracing 50-78.6%",
-                "4": "a sideways or shallow correction, typically alternating with wave 2's structure"
-            }
-            summary += f"Currently in **Wave {current_wave}** correction ({wave_context.get(current_wave, 'a corrective phase')}). "
+    if "impulse" in pattern_lower:
+        if current_wave in _IMPULSE_13_CTX:
+            summary += f"Currently positioned in **Wave {current_wave}** ({_IMPULSE_13_CTX[current_wave]}). "
+        elif current_wave in _IMPULSE_24_CTX:
+            summary += f"Currently in **Wave {current_wave}** correction ({_IMPULSE_24_CTX[current_wave]}). "
         else:
             summary += "The pattern suggests a **5-wave impulse structure** developing in the primary trend direction. "
-    elif "corrective" in primary_pattern.lower():
-        if current_wave in ["A", "C"]:
-            wave_context = {
-                "A": "the initial corrective decline, breaking the previous trend",
-                "C": "the final corrective wave, often targeting Fibonacci extensions"
-            }
-            summary += f"Currently in **Wave {current_wave}** ({wave_context.get(current_wave, 'a corrective wave')} against the main trend). "
+    elif "corrective" in pattern_lower:
+        if current_wave in _CORRECTIVE_AC_CTX:
+            summary += f"Currently in **Wave {current_wave}** ({_CORRECTIVE_AC_CTX[current_wave]} against the main trend). "
         elif current_wave == "B":
             summary += f"Currently in **Wave B** counter-correction, providing a temporary bounce that often confuses market participants. "
         else:
             summary += "The pattern indicates a **3-wave correction** running counter to the primary trend. "
-    elif "diagonal" in primary_pattern.lower():
+    elif "diagonal" in pattern_lower:
         summary += "A **diagonal (wedge) pattern** is forming, typically appearing in final wave positions and signaling potential trend exhaustion. "
     else:
         summary += f"The analysis identifies a **{primary_pattern}** pattern with {len(pivots)} significant pivot points. "
@@ -843,14 +995,9 @@ def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_c
     
     # Enhanced trading context
     if primary_score > 60:  # Only give specific trading advice for higher confidence
-        if "impulse" in primary_pattern.lower():
-            if current_wave in ["2", "4"]:
-                summary += "**Trading Opportunity**: Corrections offer potential entry points for trend continuation - watch for reversal signals at Fibonacci levels."
-            elif current_wave == "5":
-                summary += "**Trading Caution**: Final wave territory - monitor for completion signals and potential reversal patterns."
-            elif current_wave in ["1", "3"]:
-                summary += "**Trading Context**: Strong trending phase - align positions with primary direction and use pullbacks for entries."
-        elif "corrective" in primary_pattern.lower():
+        if "impulse" in pattern_lower:
+            summary += _IMPULSE_TRADING_ADVICE.get(current_wave, "")
+        elif "corrective" in pattern_lower:
             summary += "**Trading Strategy**: Counter-trend movement - expect eventual reversal, use tight stops, consider contrarian positioning."
     else:
         summary += "**Trading Approach**: Pattern still developing - wait for higher confidence or clearer directional signals before major positioning."
@@ -859,15 +1006,13 @@ def generate_chart_summary(wave_analysis, invalidation_levels, ticker, primary_c
 
 def determine_overall_trend(pivots):
     """Determine overall market trend from pivot points"""
+    pivots = PivotSoA.coerce(pivots)
     if len(pivots) < 3:
         return "insufficient data for trend determination"
     
     # Compare first few and last few pivots to determine overall direction
-    start_prices = [p['price'] for p in pivots[:3]]
-    end_prices = [p['price'] for p in pivots[-3:]]
-    
-    start_avg = sum(start_prices) / len(start_prices)
-    end_avg = sum(end_prices) / len(end_prices)
+    start_avg = pivots.price[:3].mean()
+    end_avg = pivots.price[-3:].mean()
     
     if end_avg > start_avg * 1.02:  # 2% threshold
         return "an **upward trending**"
@@ -878,19 +1023,25 @@ def determine_overall_trend(pivots):
 
 def determine_wave_trend_direction(pivots):
     """Determine wave trend direction consistent with price target calculations"""
-    if len(pivots) < 3:
+    # Only the last five pivots are read, so they alone key the memoized result
+    if isinstance(pivots, PivotSoA):
+        recent_prices = tuple(pivots.price[-5:].tolist())
+    else:
+        recent_prices = tuple(float(pivot['price']) for pivot in pivots[-5:])
+    return _wave_trend_from_prices(recent_prices)
+
+@lru_cache(maxsize=32)
+def _wave_trend_from_prices(recent_prices):
+    """Trend direction from the last (up to five) pivot prices"""
+    if len(recent_prices) < 3:
         return "neutral"
     
     # Use the same logic as calculate_price_targets for consistency
-    recent_pivots = pivots[-5:] if len(pivots) >= 5 else pivots
-    if len(recent_pivots) >= 3:
-        wave_1_start = recent_pivots[0]['price']
-        wave_1_end = recent_pivots[1]['price'] 
-        
-        if wave_1_end > wave_1_start:
-            return "upward trending"
-        elif wave_1_end < wave_1_start:
-            return "downward trending"
+    wave_1_start, wave_1_end = recent_prices[:2]
+    if wave_1_end > wave_1_start:
+        return "upward trending"
+    elif wave_1_end < wave_1_start:
+        return "downward trending"
     
     return "sideways/consolidating"
 
@@ -900,8 +1051,8 @@ def calculate_price_targets(analysis_results, current_price):
     if not analysis_results:
         return {}
     
-    primary = analysis_results.get('primary_count', {})
-    pivots = analysis_results.get('zigzag_pivots', [])
+    primary = _as_dict(analysis_results.get('primary_count', {}))
+    pivots = PivotSoA.coerce(analysis_results.get('zigzag_pivots', []))
     
     if len(pivots) < 3:
         return {}
@@ -914,43 +1065,45 @@ def calculate_price_targets(analysis_results, current_price):
     
     try:
         # Get recent pivot prices
-        recent_pivots = pivots[-5:] if len(pivots) >= 5 else pivots
-        pivot_prices = [p['price'] for p in recent_pivots]
+        pivot_prices = pivots.price[-5:]
         
         # Calculate Wave targets based on Elliott Wave principles
         if len(pivot_prices) >= 3:
             # Assume we have at least Wave 1 and Wave 2
-            wave_1_start = pivot_prices[0]
-            wave_1_end = pivot_prices[1] 
-            wave_2_end = pivot_prices[2] if len(pivot_prices) > 2 else current_price
-            
-            wave_1_length = abs(wave_1_end - wave_1_start)
+            wave_1_start, wave_1_end, wave_2_end = pivot_prices[:3].tolist()
             
+            # Direction factor: +1 for uptrend, -1 for downtrend
+            direction = 1.0 if wave_1_end > wave_1_start else -1.0
+            # The signed move already points along direction, so no abs() is needed
+            wave_1_length = direction * (wave_1_end - wave_1_start)
+
             # Wave 3 targets (typically 1.618 x Wave 1)
-            if wave_1_end > wave_1_start:  # Uptrend
-                targets['wave_targets']['wave_3_minimum'] = wave_2_end + wave_1_length
-                targets['wave_targets']['wave_3_target'] = wave_2_end + (wave_1_length * 1.618)
-                targets['wave_targets']['wave_3_extension'] = wave_2_end + (wave_1_length * 2.618)
-                
-                # Wave 5 targets (often equal to Wave 1 or 0.618 of Wave 1-3)
-                wave_1_to_3_length = abs(targets['wave_targets']['wave_3_target'] - wave_1_start)
-                targets['wave_targets']['wave_5_target'] = targets['wave_targets']['wave_3_target'] + wave_1_length
-                targets['wave_targets']['wave_5_extension'] = wave_1_start + (wave_1_to_3_length * 1.618)
-                
-            else:  # Downtrend
-                targets['wave_targets']['wave_3_minimum'] = wave_2_end - wave_1_length
-                targets['wave_targets']['wave_3_target'] = wave_2_end - (wave_1_length * 1.618)
-                targets['wave_targets']['wave_3_extension'] = wave_2_end - (wave_1_length * 2.618)
-                
-                wave_1_to_3_length = abs(targets['wave_targets']['wave_3_target'] - wave_1_start)
-                targets['wave_targets']['wave_5_target'] = targets['wave_targets']['wave_3_target'] - wave_1_length
-                targets['wave_targets']['wave_5_extension'] = wave_1_start - (wave_1_to_3_length * 1.618)
+            wave_3_minimum = wave_2_end + direction * wave_1_length
+            wave_3_target = wave_2_end + direction * wave_1_length * 1.618
+            wave_3_extension = wave_2_end + direction * wave_1_length * 2.618
+
+            # Wave 5 targets (often equal to Wave 1 or 0.618 of Wave 1-3)
+            wave_1_to_3_length = abs(wave_3_target - wave_1_start)
+            wave_5_target = wave_3_target + direction * wave_1_length
+            wave_5_extension = wave_1_start + direction * wave_1_to_3_length * 1.618
+
+            targets['wave_targets'].update({
+                'wave_3_minimum': wave_3_minimum,
+                'wave_3_target': wave_3_target,
+                'wave_3_extension': wave_3_extension,
+                'wave_5_target': wave_5_target,
+                'wave_5_extension': wave_5_extension
+            })
         
         # Support and Resistance from recent pivots
-        targets['support_resistance']['major_support'] = min(pivot_prices[-3:])
-        targets['support_resistance']['major_resistance'] = max(pivot_prices[-3:])
-        targets['support_resistance']['immediate_support'] = min(pivot_prices[-2:])
-        targets['support_resistance']['immediate_resistance'] = max(pivot_prices[-2:])
+        last3 = pivot_prices[-3:]
+        last2 = pivot_prices[-2:]
+        targets['support_resistance'] = {
+            'major_support': float(last3.min()),
+            'major_resistance': float(last3.max()),
+            'immediate_support': float(last2.min()),
+            'immediate_resistance': float(last2.max())
+        }
         
         # Enhanced Fibonacci targets
         fib_levels = analysis_results.get('fibonacci_levels', {})
@@ -962,6 +1115,15 @@ def calculate_price_targets(analysis_results, current_price):
         
     return targets
 
+# Bucket edges for trade grading: D < 1.5 <= C < 2.0 <= B < 3.0 <= A
+_GRADE_THRESHOLDS = np.array([1.5, 2.0, 3.0])
+_GRADES = ('D', 'C', 'B', 'A')
+
+# Trade quality buckets: stop loss <= 8% / <= 12%, best R:R >= 2.0 / >= 1.5
+_QUALITY_STOP_EDGES = np.array([8.0, 12.0])
+_QUALITY_RR_EDGES = np.array([1.5, 2.0])
+_QUALITY_LABELS = ('Poor', 'Fair', 'Good')
+
 def calculate_risk_management(current_price, invalidation_level, price_targets, account_size=10000, risk_percentage=2):
     """Calculate comprehensive risk management metrics for Elliott Wave trades"""
     
@@ -1005,49 +1167,61 @@ def calculate_risk_management(current_price, invalidation_level, price_targets,
             'description': f"Elliott Wave invalidation level at ${invalidation_level:.2f}"
         }
         
-        # Take profit levels from price targets
-        take_profits = []
-        if 'wave_targets' in price_targets:
-            wave_targets = price_targets['wave_targets']
-            for target_name, target_price in wave_targets.items():
-                if target_price and target_price != current_price:
-                    profit_distance = abs(target_price - current_price)
-                    profit_percentage = (profit_distance / current_price) * 100
-                    
-                    # Calculate risk-reward ratio
-                    if stop_loss_distance > 0:
-                        risk_reward_ratio = profit_distance / stop_loss_distance
-                    else:
-                        risk_reward_ratio = 0
-                    
-                    take_profits.append({
-                        'target': target_name.replace('_', ' ').title(),
-                        'price': target_price,
-                        'distance': profit_distance,
-                        'percentage': profit_percentage,
-                        'risk_reward_ratio': risk_reward_ratio
-                    })
+        # Take profit levels from price targets; nothing further to grade without them
+        wave_targets = {name: price for name, price in (price_targets.get('wave_targets') or {}).items()
+                        if price and price != current_price}
+        if not wave_targets:
+            risk_mgmt['take_profit'] = []
+            return risk_mgmt
         
-        risk_mgmt['take_profit'] = take_profits
+        prices = np.fromiter(wave_targets.values(), dtype=np.float64, count=len(wave_targets))
         
-        # Overall risk-reward analysis
-        if take_profits:
-            best_rr = max(tp['risk_reward_ratio'] for tp in take_profits if tp['risk_reward_ratio'] > 0)
-            avg_rr = np.mean([tp['risk_reward_ratio'] for tp in take_profits if tp['risk_reward_ratio'] > 0]) if take_profits else 0
-            
-            risk_mgmt['risk_reward'] = {
-                'best_ratio': best_rr,
-                'average_ratio': avg_rr,
-                'acceptable': best_rr >= 2.0,  # Professional standard
-                'grade': 'A' if best_rr >= 3.0 else 'B' if best_rr >= 2.0 else 'C' if best_rr >= 1.5 else 'D'
+        # Distances, percentages and risk-reward ratios for all targets at once
+        profit_distance = np.abs(prices - current_price)
+        profit_percentage = profit_distance / current_price * 100.0
+        if stop_loss_distance > 0:
+            rr = profit_distance / stop_loss_distance
+        else:
+            rr = np.zeros_like(profit_distance)
+        
+        risk_mgmt['take_profit'] = [
+            {
+                'target': humanize_key(name),
+                'price': price,
+                'distance': distance,
+                'percentage': percentage,
+                'risk_reward_ratio': ratio
             }
+            for name, price, distance, percentage, ratio in zip(
+                wave_targets.keys(), prices.tolist(), profit_distance.tolist(),
+                profit_percentage.tolist(), rr.tolist())
+        ]
+        
+        # Overall risk-reward analysis
+        positive_rr = rr[rr > 0]
+        if positive_rr.size:
+            best_rr, avg_rr = float(positive_rr.max()), float(positive_rr.mean())
+        else:
+            best_rr = avg_rr = 0.0
+        
+        risk_mgmt['risk_reward'] = {
+            'best_ratio': best_rr,
+            'average_ratio': avg_rr,
+            'acceptable': best_rr >= 2.0,  # Professional standard
+            'grade': _GRADES[int(np.searchsorted(_GRADE_THRESHOLDS, best_rr, side='right'))]
+        }
         
-        # Trade quality analysis
+        # Trade quality analysis: the weaker of the stop-loss and risk-reward buckets
+        stop_loss_level = 2 - int(np.searchsorted(_QUALITY_STOP_EDGES, stop_loss_percentage, side='left'))
+        if stop_loss_level:
+            quality_level = min(stop_loss_level, int(np.searchsorted(_QUALITY_RR_EDGES, best_rr, side='right')))
+        else:
+            quality_level = 0
         risk_mgmt['trade_analysis'] = {
             'stop_loss_reasonable': stop_loss_percentage <= 10,  # Stop loss should be reasonable
             'position_size_reasonable': position_value <= account_size * 0.2,  # Max 20% of account per trade
             'risk_appropriate': risk_percentage <= 3,  # Max 3% risk per trade
-            'overall_quality': 'Good' if stop_loss_percentage <= 8 and best_rr >= 2.0 else 'Fair' if stop_loss_percentage <= 12 and best_rr >= 1.5 else 'Poor'
+            'overall_quality': _QUALITY_LABELS[quality_level]
         }
         
     except Exception as e:
@@ -1055,6 +1229,81 @@ def calculate_risk_management(current_price, invalidation_level, price_targets,
     
     return risk_mgmt
 
+# Static card markup for display_risk_management; only the values change per rerun
+_QUALITY_COLOR = {'Good': '#28a745', 'Fair': '#ffc107', 'Poor': '#dc3545'}
+_GRADE_COLOR = {'A': '#28a745', 'B': '#17a2b8', 'C': '#ffc107', 'D': '#dc3545'}
+
+_POSITION_CARD_TMPL = """
+<div class="price-card" style="background-color: {bg}; border-left: 4px solid {border};">
+    <h4 style="color: {color}; margin-bottom: 10px;">{title}</h4>
+    <h3 style="color: #212529; margin: 0;">{value}</h3>
+    <p style="color: #6c757d; margin: 5px 0 0 0;">{sub}</p>
+</div>
+"""
+
+_RR_CARD_TMPL = """
+<div class="price-card" style="background-color: {bg}; border-left: 4px solid {border};">
+    <h4 style="color: {color}; margin-bottom: 10px;">{title}</h4>
+    <h2 style="color: #212529; margin: 0;">{value}</h2>
+    <p style="color: #6c757d; margin: 5px 0 0 0;">{sub}</p>
+</div>
+"""
+
+# Colour LUTs indexed by bin: R:R < 1.5 / < 2.0 / >= 2.0, score < 50 / < 70 / >= 70
+_RR_BIN_EDGES = np.array([1.5, 2.0])
+_RR_COLOR_LUT = ('#dc3545', '#ffc107', '#28a745')
+_SCORE_BIN_EDGES = np.array([50, 70])
+_SCORE_COLOR_LUT = ('#dc3545', '#ffc107', '#28a745')
+_SCORE_GRADE_LUT = ('Low', 'Moderate', 'High')
+
+_TP_CARD_TMPL = """
+<div class="price-card" style="background-color: #d1ecf1; border: 2px solid {rr_color}; border-radius: 8px; margin-bottom: 10px;">
+    <div style="display: flex; justify-content: between; align-items: center;">
+        <div style="flex: 1;">
+            <h4 style="color: #0c5460; margin: 0 0 5px 0;">{target}</h4>
+            <p style="color: #0c5460; margin: 0; font-size: 0.9em;">
+                Price: <strong>${price:.2f}</strong> | 
+                Distance: <strong>${distance:.2f}</strong> ({percentage:.1f}%)
+            </p>
+        </div>
+        <div style="text-align: right;">
+            <span style="background: {rr_color}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">
+                R:R {rr:.1f}:1
+            </span>
+        </div>
+    </div>
+</div>
+"""
+
+_CARD_GRID_TMPL = '<div style="display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 12px;">{cards}</div>'
+
+_STOP_LOSS_CARD_TMPL = """
+<div class="price-card" style="background-color: #f8d7da; border: 2px solid #dc3545; border-radius: 8px;">
+    <div style="display: flex; align-items: center; margin-bottom: 10px;">
+        <span style="font-size: 1.5em; margin-right: 10px;">🛑</span>
+        <div>
+            <h4 style="color: #721c24; margin: 0;">Stop Loss: ${price:.2f}</h4>
+            <p style="color: #721c24; margin: 0; font-size: 0.9em;">{description}</p>
+        </div>
+    </div>
+    <div style="display: flex; justify-content: space-between;">
+        <span><strong>Distance:</strong> ${distance:.2f}</span>
+        <span><strong>Risk:</strong> {percentage:.1f}%</span>
+    </div>
+</div>
+"""
+
+def render_card_grid(template, cards):
+    """Render a row of cards as a single CSS grid block"""
+    render_html_grid([template.format_map(card) for card in cards])
+
+def render_html_grid(cards_html, columns=None):
+    """Render already formatted cards as a single CSS grid block"""
+    st.markdown(_CARD_GRID_TMPL.format(
+        columns=columns or len(cards_html),
+        cards="".join(card.strip() for card in cards_html)
+    ), unsafe_allow_html=True)
+
 def display_risk_management(risk_mgmt, ticker):
     """Display comprehensive risk management analysis"""
     
@@ -1067,134 +1316,75 @@ def display_risk_management(risk_mgmt, ticker):
     # Position Sizing Section
     if 'position_sizing' in risk_mgmt and risk_mgmt['position_sizing']:
         ps = risk_mgmt['position_sizing']
+        quality = risk_mgmt.get('trade_analysis', {}).get('overall_quality', 'Unknown')
+        quality_color = _QUALITY_COLOR.get(quality, '#6c757d')
+        
+        position_cards = [
+            {'bg': '#e8f4fd', 'border': '#1f77b4', 'color': '#1f77b4', 'title': 'Recommended Shares',
+             'value': f"{ps['shares']:,}", 'sub': f"shares of {ticker}"},
+            {'bg': '#f8f9fa', 'border': '#6c757d', 'color': '#6c757d', 'title': 'Position Value',
+             'value': f"${ps['position_value']:,.2f}", 'sub': 'total investment'},
+            {'bg': '#fff3cd', 'border': '#ffc107', 'color': '#856404', 'title': 'Risk Amount',
+             'value': f"${ps['risk_amount']:,.2f}", 'sub': f"max loss ({ps['risk_percentage']}%)"},
+            {'bg': '#f8f9fa', 'border': quality_color, 'color': quality_color, 'title': 'Trade Quality',
+             'value': quality, 'sub': 'assessment'},
+        ]
         
         st.markdown("#### 📊 Position Sizing")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #e8f4fd; border-left: 4px solid #1f77b4;">
-                <h4 style="color: #1f77b4; margin-bottom: 10px;">Recommended Shares</h4>
-                <h3 style="color: #212529; margin: 0;">{ps['shares']:,}</h3>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">shares of {ticker}</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #f8f9fa; border-left: 4px solid #6c757d;">
-                <h4 style="color: #6c757d; margin-bottom: 10px;">Position Value</h4>
-                <h3 style="color: #212529; margin: 0;">${ps['position_value']:,.2f}</h3>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">total investment</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #fff3cd; border-left: 4px solid #ffc107;">
-                <h4 style="color: #856404; margin-bottom: 10px;">Risk Amount</h4>
-                <h3 style="color: #212529; margin: 0;">${ps['risk_amount']:,.2f}</h3>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">max loss ({ps['risk_percentage']}%)</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            quality = risk_mgmt.get('trade_analysis', {}).get('overall_quality', 'Unknown')
-            quality_color = {'Good': '#28a745', 'Fair': '#ffc107', 'Poor': '#dc3545'}.get(quality, '#6c757d')
-            
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #f8f9fa; border-left: 4px solid {quality_color};">
-                <h4 style="color: {quality_color}; margin-bottom: 10px;">Trade Quality</h4>
-                <h3 style="color: #212529; margin: 0;">{quality}</h3>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">assessment</p>
-            </div>
-            """, unsafe_allow_html=True)
+        render_card_grid(_POSITION_CARD_TMPL, position_cards)
     
     # Stop Loss Section
     if 'stop_loss' in risk_mgmt and risk_mgmt['stop_loss']:
-        sl = risk_mgmt['stop_loss']
-        
         st.markdown("#### 🛑 Stop Loss Strategy")
-        st.markdown(f"""
-        <div class="price-card" style="background-color: #f8d7da; border: 2px solid #dc3545; border-radius: 8px;">
-            <div style="display: flex; align-items: center; margin-bottom: 10px;">
-                <span style="font-size: 1.5em; margin-right: 10px;">🛑</span>
-                <div>
-                    <h4 style="color: #721c24; margin: 0;">Stop Loss: ${sl['price']:.2f}</h4>
-                    <p style="color: #721c24; margin: 0; font-size: 0.9em;">{sl['description']}</p>
-                </div>
-            </div>
-            <div style="display: flex; justify-content: space-between;">
-                <span><strong>Distance:</strong> ${sl['distance']:.2f}</span>
-                <span><strong>Risk:</strong> {sl['percentage']:.1f}%</span>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_STOP_LOSS_CARD_TMPL.format_map(risk_mgmt['stop_loss']), unsafe_allow_html=True)
     
     # Take Profit Targets
     if 'take_profit' in risk_mgmt and risk_mgmt['take_profit']:
         st.markdown("#### 🎯 Take Profit Targets")
         
+        parts = []
         for tp in risk_mgmt['take_profit']:
-            rr_color = '#28a745' if tp['risk_reward_ratio'] >= 2.0 else '#ffc107' if tp['risk_reward_ratio'] >= 1.5 else '#dc3545'
-            
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #d1ecf1; border: 2px solid {rr_color}; border-radius: 8px; margin-bottom: 10px;">
-                <div style="display: flex; justify-content: between; align-items: center;">
-                    <div style="flex: 1;">
-                        <h4 style="color: #0c5460; margin: 0 0 5px 0;">{tp['target']}</h4>
-                        <p style="color: #0c5460; margin: 0; font-size: 0.9em;">
-                            Price: <strong>${tp['price']:.2f}</strong> | 
-                            Distance: <strong>${tp['distance']:.2f}</strong> ({tp['percentage']:.1f}%)
-                        </p>
-                    </div>
-                    <div style="text-align: right;">
-                        <span style="background: {rr_color}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">
-                            R:R {tp['risk_reward_ratio']:.1f}:1
-                        </span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            rr_color = _RR_COLOR_LUT[int(np.searchsorted(_RR_BIN_EDGES, tp['risk_reward_ratio'], side='right'))]
+            parts.append(_TP_CARD_TMPL.format(
+                rr_color=rr_color,
+                target=tp['target'],
+                price=tp['price'],
+                distance=tp['distance'],
+                percentage=tp['percentage'],
+                rr=tp['risk_reward_ratio']
+            ).strip())
+        st.markdown("".join(parts), unsafe_allow_html=True)
     
     # Risk-Reward Summary
     if 'risk_reward' in risk_mgmt and risk_mgmt['risk_reward']:
         rr = risk_mgmt['risk_reward']
+        grade_color = _GRADE_COLOR.get(rr['grade'], '#6c757d')
+        acceptable_color = '#28a745' if rr['acceptable'] else '#dc3545'
+        
+        rr_cards = [
+            {'bg': '#f8f9fa', 'border': grade_color, 'color': grade_color, 'title': 'Trade Grade',
+             'value': rr['grade'], 'sub': 'overall rating'},
+            {'bg': '#d4edda', 'border': '#28a745', 'color': '#155724', 'title': 'Best R:R Ratio',
+             'value': f"{rr['best_ratio']:.1f}:1", 'sub': 'max potential'},
+            {'bg': '#f8f9fa', 'border': acceptable_color, 'color': acceptable_color, 'title': 'Professional Grade',
+             'value': 'Yes' if rr['acceptable'] else 'No', 'sub': '≥ 2:1 ratio'},
+        ]
         
         st.markdown("#### ⚖️ Risk-Reward Analysis")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            grade_color = {'A': '#28a745', 'B': '#17a2b8', 'C': '#ffc107', 'D': '#dc3545'}.get(rr['grade'], '#6c757d')
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #f8f9fa; border-left: 4px solid {grade_color};">
-                <h4 style="color: {grade_color}; margin-bottom: 10px;">Trade Grade</h4>
-                <h2 style="color: #212529; margin: 0;">{rr['grade']}</h2>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">overall rating</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #d4edda; border-left: 4px solid #28a745;">
-                <h4 style="color: #155724; margin-bottom: 10px;">Best R:R Ratio</h4>
-                <h2 style="color: #212529; margin: 0;">{rr['best_ratio']:.1f}:1</h2>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">max potential</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            acceptable_color = '#28a745' if rr['acceptable'] else '#dc3545'
-            acceptable_text = 'Yes' if rr['acceptable'] else 'No'
-            
-            st.markdown(f"""
-            <div class="price-card" style="background-color: #f8f9fa; border-left: 4px solid {acceptable_color};">
-                <h4 style="color: {acceptable_color}; margin-bottom: 10px;">Professional Grade</h4>
-                <h2 style="color: #212529; margin: 0;">{acceptable_text}</h2>
-                <p style="color: #6c757d; margin: 5px 0 0 0;">≥ 2:1 ratio</p>
-            </div>
-            """, unsafe_allow_html=True)
+        render_card_grid(_RR_CARD_TMPL, rr_cards)
+
+# Common Fibonacci ratios checked by the confidence scoring
+_COMMON_RETRACEMENTS = np.array([0.382, 0.5, 0.618, 0.786])
+_COMMON_EXTENSIONS = np.array([1.0, 1.272, 1.618, 2.618])
+
+def count_common_fib_levels(level_entries, common_levels, tolerance):
+    """Count Fibonacci levels lying within tolerance of any common ratio"""
+    levels = np.fromiter(
+        (ld['level'] for ld in level_entries if isinstance(ld, dict) and 'level' in ld),
+        dtype=np.float64
+    )
+    matches = np.abs(levels[:, None] - common_levels[None, :]) < tolerance
+    return int(matches.any(axis=1).sum())
 
 def calculate_detailed_confidence_score(analysis_results, pivots, price_data=None):
     """Calculate detailed confidence scoring with breakdown of factors"""
@@ -1202,10 +1392,12 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
     if not analysis_results or not pivots:
         return {}
     
-    primary = analysis_results.get('primary_count', {})
+    primary = _as_dict(analysis_results.get('primary_count', {}))
     if not primary:
         return {}
     
+    pivots = PivotSoA.coerce(pivots)
+    
     confidence_breakdown = {
         'overall_score': 0,
         'factors': {},
@@ -1241,23 +1433,11 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
             
             # Check retracement levels
             if 'retracement' in fib_levels:
-                ret_levels = fib_levels['retracement']
-                common_rets = [0.382, 0.5, 0.618, 0.786]
-                for level_data in ret_levels:
-                    if isinstance(level_data, dict) and 'level' in level_data:
-                        level = level_data['level']
-                        if any(abs(level - common) < 0.05 for common in common_rets):
-                            fib_relationships += 1
+                fib_relationships += count_common_fib_levels(fib_levels['retracement'], _COMMON_RETRACEMENTS, 0.05)
             
             # Check extension levels  
             if 'extension' in fib_levels:
-                ext_levels = fib_levels['extension']
-                common_exts = [1.0, 1.272, 1.618, 2.618]
-                for level_data in ext_levels:
-                    if isinstance(level_data, dict) and 'level' in level_data:
-                        level = level_data['level']
-                        if any(abs(level - common) < 0.1 for common in common_exts):
-                            fib_relationships += 1
+                fib_relationships += count_common_fib_levels(fib_levels['extension'], _COMMON_EXTENSIONS, 0.1)
             
             fib_score = min(100, fib_relationships * 25)  # Up to 4 relationships
             
@@ -1280,37 +1460,30 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
         proportion_score = 0
         if len(pivots) >= 5:
             # Calculate wave lengths
-            wave_lengths = []
-            for i in range(len(pivots) - 1):
-                length = abs(pivots[i+1]['price'] - pivots[i]['price'])
-                wave_lengths.append(length)
+            wave_lengths = np.abs(np.diff(pivots.price)).tolist()
             
-            if len(wave_lengths) >= 4:
-                # Check Elliott Wave rules
-                # Wave 3 should not be the shortest
-                if len(wave_lengths) >= 3:
-                    wave_3_length = wave_lengths[2] if len(wave_lengths) > 2 else 0
-                    wave_1_length = wave_lengths[0] if len(wave_lengths) > 0 else 0
-                    wave_5_length = wave_lengths[4] if len(wave_lengths) > 4 else 0
-                    
-                    if wave_3_length > 0:
-                        if wave_1_length > 0 and wave_3_length > wave_1_length:
-                            proportion_score += 40
-                            confidence_breakdown['strengths'].append("✅ Wave 3 longer than Wave 1")
-                        else:
-                            confidence_breakdown['weaknesses'].append("❌ Wave 3 may be too short")
-                        
-                        if wave_5_length > 0 and wave_3_length > wave_5_length:
-                            proportion_score += 40
-                        elif wave_5_length == 0:
-                            proportion_score += 20  # Wave 5 not complete yet
-                        
-                        # Additional points for reasonable proportions
-                        if wave_1_length > 0:
-                            ratio_3_to_1 = wave_3_length / wave_1_length
-                            if 1.2 <= ratio_3_to_1 <= 4.0:  # Reasonable range
-                                proportion_score += 20
-                                confidence_breakdown['strengths'].append("✅ Good Wave 3/Wave 1 proportion")
+            # Waves 1, 3 and 5 (wave 5 counts as 0 while still incomplete)
+            padded = wave_lengths + [0.0] * (5 - len(wave_lengths)) if len(wave_lengths) < 5 else wave_lengths
+            wave_1_length, _, wave_3_length, _, wave_5_length = padded[:5]
+            
+            if wave_3_length > 0:
+                if wave_1_length > 0 and wave_3_length > wave_1_length:
+                    proportion_score += 40
+                    confidence_breakdown['strengths'].append("✅ Wave 3 longer than Wave 1")
+                else:
+                    confidence_breakdown['weaknesses'].append("❌ Wave 3 may be too short")
+                
+                if wave_5_length > 0 and wave_3_length > wave_5_length:
+                    proportion_score += 40
+                elif wave_5_length == 0:
+                    proportion_score += 20  # Wave 5 not complete yet
+                
+                # Additional points for reasonable proportions
+                if wave_1_length > 0:
+                    ratio_3_to_1 = wave_3_length / wave_1_length
+                    if 1.2 <= ratio_3_to_1 <= 4.0:  # Reasonable range
+                        proportion_score += 20
+                        confidence_breakdown['strengths'].append("✅ Good Wave 3/Wave 1 proportion")
         
         confidence_breakdown['factors']['proportions'] = {
             'score': proportion_score,
@@ -1324,7 +1497,7 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
         if "trending" in wave_trend:
             if len(pivots) >= 3:
                 # Check for clear trend progression
-                recent_prices = [p['price'] for p in pivots[-5:]]
+                recent_prices = pivots.price[-5:]
                 if len(recent_prices) >= 3:
                     if "upward" in wave_trend:
                         if recent_prices[-1] > recent_prices[0]:  # Higher high
@@ -1350,7 +1523,7 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
         
         # Factor 5: Pattern Recognition (10% weight)
         pattern_score = 0
-        primary_pattern = getattr(primary, 'pattern_type', '') if hasattr(primary, 'pattern_type') else primary.get('pattern_type', '')
+        primary_pattern = primary.get('pattern_type', '')
         
         if primary_pattern:
             if primary_pattern.lower() in ['impulse', 'motive']:
@@ -1416,6 +1589,53 @@ def calculate_detailed_confidence_score(analysis_results, pivots, price_data=Non
     
     return confidence_breakdown
 
+_CONFIDENCE_SCORE_CARD_TMPL = """
+<div class="price-card" style="background: {gradient}; border: 3px solid {color}; text-align: center;">
+    <h2 style="color: {color}; margin-bottom: 10px;">Overall Confidence Score</h2>
+    <h1 style="color: #212529; margin: 10px 0; font-size: 3em;">{score}%</h1>
+    <h3 style="color: {color}; margin: 0;">{grade} Confidence</h3>
+</div>
+"""
+
+_CONFIDENCE_FACTOR_ROW_TMPL = """
+<div style="display: grid; grid-template-columns: 3fr 1fr 1fr; gap: 12px; align-items: center;">
+    <div class="price-card" style="border-left: 4px solid {color}; margin: 5px 0;">
+        <h4 style="color: {color}; margin-bottom: 5px;">{title}</h4>
+        <p style="color: #6c757d; margin: 0; font-size: 0.9em;">{description}</p>
+    </div>
+    <div class="risk-metric">
+        <strong style="color: {color}; font-size: 1.2em;">{score:.0f}%</strong><br>
+        <small style="color: #6c757d;">Score</small>
+    </div>
+    <div class="risk-metric">
+        <strong style="color: #6c757d; font-size: 1.2em;">{weight}%</strong><br>
+        <small style="color: #6c757d;">Weight</small>
+    </div>
+</div>
+"""
+
+@st.cache_data(max_entries=128)
+def _build_confidence_html(score_key, factors_key):
+    """Build the overall score card and factor breakdown HTML for display_confidence_analysis"""
+    score_bin = int(np.searchsorted(_SCORE_BIN_EDGES, score_key, side='right'))
+    score_color = _SCORE_COLOR_LUT[score_bin]
+    score_html = _CONFIDENCE_SCORE_CARD_TMPL.format(
+        gradient=GRADIENTS[score_color], color=score_color, score=score_key, grade=_SCORE_GRADE_LUT[score_bin]
+    )
+    
+    rows = []
+    for factor_name, score, weight, description in factors_key:
+        factor_color = _SCORE_COLOR_LUT[int(np.searchsorted(_SCORE_BIN_EDGES, score, side='right'))]
+        rows.append(_CONFIDENCE_FACTOR_ROW_TMPL.format(
+            color=factor_color,
+            title=humanize_key(factor_name),
+            description=description,
+            score=score,
+            weight=weight
+        ).strip())
+    
+    return score_html, "".join(rows)
+
 def display_confidence_analysis(confidence_data):
     """Display detailed confidence analysis breakdown"""
     
@@ -1423,62 +1643,23 @@ def display_confidence_analysis(confidence_data):
         st.info("💡 Confidence analysis requires completed Elliott Wave analysis")
         return
     
-    overall_score = confidence_data['overall_score']
+    # Key the cached HTML on the displayed (rounded) score and the factor values
+    factors_key = tuple(
+        (factor_name, factor_data['score'], factor_data['weight'], factor_data['description'])
+        for factor_name, factor_data in confidence_data.get('factors', {}).items()
+    )
+    score_html, factors_html = _build_confidence_html(round(confidence_data['overall_score']), factors_key)
     
     st.markdown("### 🎯 **Wave Confidence Analysis**")
     
     # Overall Score Display
-    score_color = '#28a745' if overall_score >= 70 else '#ffc107' if overall_score >= 50 else '#dc3545'
-    score_grade = 'High' if overall_score >= 70 else 'Moderate' if overall_score >= 50 else 'Low'
-    
-    st.markdown(f"""
-    <div class="price-card" style="background: linear-gradient(135deg, {score_color}22, {score_color}11); border: 3px solid {score_color}; text-align: center;">
-        <h2 style="color: {score_color}; margin-bottom: 10px;">Overall Confidence Score</h2>
-        <h1 style="color: #212529; margin: 10px 0; font-size: 3em;">{overall_score:.0f}%</h1>
-        <h3 style="color: {score_color}; margin: 0;">{score_grade} Confidence</h3>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(score_html, unsafe_allow_html=True)
     
     # Factor Breakdown
     st.markdown("#### 📊 Confidence Factor Breakdown")
     
-    if 'factors' in confidence_data:
-        for factor_name, factor_data in confidence_data['factors'].items():
-            score = factor_data['score']
-            weight = factor_data['weight']
-            description = factor_data['description']
-            
-            # Calculate contribution to overall score
-            contribution = (score * weight) / 100
-            
-            # Color coding for factor scores
-            factor_color = '#28a745' if score >= 70 else '#ffc107' if score >= 50 else '#dc3545'
-            
-            col1, col2, col3 = st.columns([3, 1, 1])
-            
-            with col1:
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {factor_color}; margin: 5px 0;">
-                    <h4 style="color: {factor_color}; margin-bottom: 5px;">{factor_name.replace('_', ' ').title()}</h4>
-                    <p style="color: #6c757d; margin: 0; font-size: 0.9em;">{description}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="risk-metric">
-                    <strong style="color: {factor_color}; font-size: 1.2em;">{score:.0f}%</strong><br>
-                    <small style="color: #6c757d;">Score</small>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="risk-metric">
-                    <strong style="color: #6c757d; font-size: 1.2em;">{weight}%</strong><br>
-                    <small style="color: #6c757d;">Weight</small>
-                </div>
-                """, unsafe_allow_html=True)
+    if factors_html:
+        st.markdown(factors_html, unsafe_allow_html=True)
     
     # Strengths and Weaknesses
     col1, col2 = st.columns(2)
@@ -1486,40 +1667,93 @@ def display_confidence_analysis(confidence_data):
     with col1:
         if confidence_data.get('strengths'):
             st.markdown("#### 💪 **Analysis Strengths**")
-            for strength in confidence_data['strengths']:
-                st.markdown(f"- {strength}")
+            st.markdown("\n".join(f"- {strength}" for strength in confidence_data['strengths']))
     
     with col2:
         if confidence_data.get('weaknesses'):
             st.markdown("#### ⚠️ **Areas for Improvement**")
-            for weakness in confidence_data['weaknesses']:
-                st.markdown(f"- {weakness}")
+            st.markdown("\n".join(f"- {weakness}" for weakness in confidence_data['weaknesses']))
     
     # Recommendations
     if confidence_data.get('recommendations'):
         st.markdown("#### 🎯 **Trading Recommendations**")
-        for i, rec in enumerate(confidence_data['recommendations'], 1):
-            st.markdown(f"{i}. {rec}")
+        st.markdown("\n".join(f"{i}. {rec}" for i, rec in enumerate(confidence_data['recommendations'], 1)))
+
+def rolling_mean(values, window):
+    """Trailing-window mean of a float array, NaN until the window is full"""
+    if bn is not None:
+        return bn.move_mean(values, window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+    return result
+
+def rolling_std(values, window):
+    """Trailing-window sample standard deviation (ddof=1), NaN until the window is full"""
+    if bn is not None:
+        return bn.move_std(values, window, min_count=window, ddof=1)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).std(axis=1, ddof=1)
+    return result
+
+def rolling_min(values, window):
+    """Trailing-window minimum, NaN until the window is full"""
+    if bn is not None:
+        return bn.move_min(values, window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).min(axis=1)
+    return result
 
+def rolling_max(values, window):
+    """Trailing-window maximum, NaN until the window is full"""
+    if bn is not None:
+        return bn.move_max(values, window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).max(axis=1)
+    return result
+
+# Bounded 0-100 oscillators are only shown to one decimal and bucketed against round thresholds
+_FLOAT32_INDICATORS = frozenset({'rsi', 'stoch_k', 'stoch_d'})
+
+def compact_indicators(indicators):
+    """Indicator arrays as float64, with the display-only oscillators narrowed to float32"""
+    return {
+        name: np.asarray(values, dtype=np.float32 if name in _FLOAT32_INDICATORS else np.float64)
+        for name, values in indicators.items()
+    }
+
+@st.cache_data(hash_funcs={pd.DataFrame: _price_frame_key}, max_entries=32)
 def calculate_technical_indicators(df):
     """Calculate comprehensive technical indicators for confluence analysis"""
     
     if df is None or df.empty or len(df) < 20:
         return {}
     
+    # Single fused pass over the price arrays when Numba is available
+    if NUMBA_AVAILABLE:
+        return compact_indicators(compute_indicators(
+            df['close'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy(),
+            df['volume'].to_numpy() if 'volume' in df.columns else None
+        ))
+    
     indicators = {}
     
     try:
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # RSI (Relative Strength Index)
         def calculate_rsi(prices, window=14):
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-            rs = gain / loss
-            return 100 - (100 / (1 + rs))
+            delta = np.diff(prices, prepend=prices[0])
+            gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+            loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = gain / loss
+                return 100 - (100 / (1 + rs))
         
-        indicators['rsi'] = calculate_rsi(df['close'])
-        current_rsi = indicators['rsi'].iloc[-1] if not indicators['rsi'].empty else 50
+        indicators['rsi'] = calculate_rsi(close)
         
         # MACD (Moving Average Convergence Divergence)
         def calculate_macd(prices, fast=12, slow=26, signal=9):
@@ -1535,9 +1769,12 @@ def calculate_technical_indicators(df):
         indicators['macd_signal'] = signal_line
         indicators['macd_histogram'] = histogram
         
-        # Moving Averages
+        # Moving Averages (SMA 50 is undefined on every bar of a shorter series)
         indicators['sma_20'] = df['close'].rolling(window=20).mean()
-        indicators['sma_50'] = df['close'].rolling(window=50).mean()
+        if len(df) >= 50:
+            indicators['sma_50'] = df['close'].rolling(window=50).mean()
+        else:
+            indicators['sma_50'] = np.full(len(df), np.nan)
         indicators['ema_20'] = df['close'].ewm(span=20).mean()
         indicators['ema_50'] = df['close'].ewm(span=50).mean()
         
@@ -1546,22 +1783,26 @@ def calculate_technical_indicators(df):
             indicators['volume_sma'] = df['volume'].rolling(window=20).mean()
             indicators['volume_ratio'] = df['volume'] / indicators['volume_sma']
             
-            # Volume-Price Trend (VPT)
-            indicators['vpt'] = (df['volume'] * (df['close'].pct_change())).cumsum()
+            # Volume-Price Trend (VPT): cumulative volume-weighted returns, undefined on the first bar
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            vpt = np.full(len(close), np.nan)
+            vpt[1:] = np.cumsum(volume[1:] * (np.diff(close) / close[:-1]))
+            indicators['vpt'] = vpt
         
         # Bollinger Bands
-        sma_20 = df['close'].rolling(window=20).mean()
-        std_20 = df['close'].rolling(window=20).std()
+        sma_20 = rolling_mean(close, 20)
+        std_20 = rolling_std(close, 20)
         indicators['bb_upper'] = sma_20 + (std_20 * 2)
         indicators['bb_lower'] = sma_20 - (std_20 * 2)
         indicators['bb_middle'] = sma_20
         
         # Stochastic Oscillator
         def calculate_stochastic(df, k_window=14, d_window=3):
-            lowest_low = df['low'].rolling(window=k_window).min()
-            highest_high = df['high'].rolling(window=k_window).max()
-            k_percent = 100 * ((df['close'] - lowest_low) / (highest_high - lowest_low))
-            d_percent = k_percent.rolling(window=d_window).mean()
+            lowest_low = rolling_min(df['low'].to_numpy(dtype=np.float64), k_window)
+            highest_high = rolling_max(df['high'].to_numpy(dtype=np.float64), k_window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+            d_percent = rolling_mean(k_percent, d_window)
             return k_percent, d_percent
         
         indicators['stoch_k'], indicators['stoch_d'] = calculate_stochastic(df)
@@ -1569,7 +1810,49 @@ def calculate_technical_indicators(df):
     except Exception as e:
         st.error(f"Error calculating technical indicators: {str(e)}")
     
-    return indicators
+    # Plain arrays keep the cached payload small and cheap to copy
+    return compact_indicators(indicators)
+
+# Indicator bands are indexed 0 below the lower bound, 1 inside (or NaN), 2 above the upper bound
+_RSI_BANDS = (30, 70)
+# RSI signals outside these bounds are reported as strong
+_RSI_STRENGTH_BANDS = (20, 80)
+_STOCH_BANDS = (20, 80)
+_SCORE_BANDS = (-30, 30)
+_OSCILLATOR_COLORS = ('#28a745', '#ffc107', '#dc3545')
+_OSCILLATOR_STATUS = ('Oversold', 'Neutral', 'Overbought')
+_SCORE_COLORS = ('#dc3545', '#ffc107', '#28a745')
+_WAVE_ALIGNMENTS = ('bearish', 'neutral', 'bullish')
+_RSI_SIGNALS = (
+    ('bullish', 'bullish_signals', "📈 RSI Oversold ({:.1f})"),
+    ('neutral', 'neutral_signals', "➖ RSI Neutral ({:.1f})"),
+    ('bearish', 'bearish_signals', "📉 RSI Overbought ({:.1f})")
+)
+_VOLUME_SIGNALS = (
+    ('low_interest', "📊 Low Volume ({:.1f}x)"),
+    ('neutral', "📊 Average Volume ({:.1f}x)"),
+    ('strong_interest', "📊 High Volume Confirmation ({:.1f}x)")
+)
+_VOLUME_SIGNAL_LISTS = ('neutral_signals', 'neutral_signals', 'bullish_signals')
+
+# Indicators that must all be present for a combined analysis or card
+_MACD_KEYS = frozenset({'macd', 'macd_signal', 'macd_histogram'})
+_MACD_LINE_KEYS = frozenset({'macd', 'macd_signal'})
+_MA_KEYS = frozenset({'sma_20', 'sma_50'})
+_STOCH_KEYS = frozenset({'stoch_k', 'stoch_d'})
+_BOLLINGER_KEYS = frozenset({'bb_upper', 'bb_lower', 'bb_middle'})
+
+# Two-way and volume lookups are indexed by the comparison result
+_TREND_COLORS = ('#dc3545', '#28a745')
+_TREND_LABELS = ('Bearish', 'Bullish')
+_POSITION_LABELS = ('Below', 'Above')
+_VOLUME_COLORS = ('#dc3545', '#ffc107', '#28a745')
+_VOLUME_STATUS = ('Low', 'Normal', 'High')
+
+def band_index(value, bounds):
+    """Index of the band a value falls in; NaN counts as inside the bounds"""
+    lower, upper = bounds
+    return 1 + int(value > upper) - int(value < lower)
 
 def analyze_indicator_confluence(indicators, current_price, wave_analysis):
     """Analyze confluence between technical indicators and Elliott Wave analysis"""
@@ -1577,6 +1860,20 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
     if not indicators:
         return {}
     
+    # Confluence only reads the last two values of each series, so those form the cache key
+    tails = tuple((name, tuple(values[-2:].tolist())) for name, values in indicators.items())
+    wave_trend = determine_wave_trend_direction(wave_analysis.get('zigzag_pivots', [])) if wave_analysis else None
+    return _indicator_confluence(tails, round(float(current_price), 6), wave_trend)
+
+@st.cache_data(max_entries=64)
+def _indicator_confluence(tails, current_price, wave_trend):
+    """Score indicator signals from the trailing values of each indicator series"""
+    
+    # Current and previous bar of every indicator, looked up once
+    latest = {name: values[-1] for name, values in tails if values}
+    prev = {name: values[-2] if len(values) > 1 else values[-1] for name, values in tails if values}
+    present = latest.keys()
+    
     confluence = {
         'overall_score': 0,
         'bullish_signals': [],
@@ -1588,33 +1885,25 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
     
     try:
         # RSI Analysis
-        if 'rsi' in indicators and not indicators['rsi'].empty:
-            current_rsi = indicators['rsi'].iloc[-1]
+        if 'rsi' in latest:
+            current_rsi = latest['rsi']
+            signal, signal_list, message = _RSI_SIGNALS[band_index(current_rsi, _RSI_BANDS)]
             rsi_analysis = {
                 'value': current_rsi,
-                'signal': 'neutral',
-                'strength': 'moderate'
+                'signal': signal,
+                # Beyond 20/80 the reading is strong; inside it the RSI is at most moderate
+                'strength': ('moderate', 'strong')[band_index(current_rsi, _RSI_STRENGTH_BANDS) != 1]
             }
-            
-            if current_rsi > 70:
-                rsi_analysis['signal'] = 'bearish'
-                rsi_analysis['strength'] = 'strong' if current_rsi > 80 else 'moderate'
-                confluence['bearish_signals'].append(f"📉 RSI Overbought ({current_rsi:.1f})")
-            elif current_rsi < 30:
-                rsi_analysis['signal'] = 'bullish'
-                rsi_analysis['strength'] = 'strong' if current_rsi < 20 else 'moderate'
-                confluence['bullish_signals'].append(f"📈 RSI Oversold ({current_rsi:.1f})")
-            else:
-                confluence['neutral_signals'].append(f"➖ RSI Neutral ({current_rsi:.1f})")
+            confluence[signal_list].append(message.format(current_rsi))
             
             confluence['indicator_analysis']['rsi'] = rsi_analysis
         
         # MACD Analysis
-        if all(key in indicators for key in ['macd', 'macd_signal', 'macd_histogram']):
-            current_macd = indicators['macd'].iloc[-1]
-            current_signal = indicators['macd_signal'].iloc[-1]
-            current_hist = indicators['macd_histogram'].iloc[-1]
-            prev_hist = indicators['macd_histogram'].iloc[-2] if len(indicators['macd_histogram']) > 1 else current_hist
+        if _MACD_KEYS <= present:
+            current_macd = latest['macd']
+            current_signal = latest['macd_signal']
+            current_hist = latest['macd_histogram']
+            prev_hist = prev['macd_histogram']
             
             macd_analysis = {
                 'macd_line': current_macd,
@@ -1639,23 +1928,22 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
                     confluence['neutral_signals'].append("➖ MACD Below Signal (Weakening)")
             
             # Check for crossovers
-            if len(indicators['macd']) > 1 and len(indicators['macd_signal']) > 1:
-                prev_macd = indicators['macd'].iloc[-2]
-                prev_signal = indicators['macd_signal'].iloc[-2]
-                
-                if prev_macd <= prev_signal and current_macd > current_signal:
-                    macd_analysis['crossover'] = True
-                    confluence['bullish_signals'].append("🔥 MACD Bullish Crossover")
-                elif prev_macd >= prev_signal and current_macd < current_signal:
-                    macd_analysis['crossover'] = True
-                    confluence['bearish_signals'].append("🔥 MACD Bearish Crossover")
+            prev_macd = prev['macd']
+            prev_signal = prev['macd_signal']
+            
+            if prev_macd <= prev_signal and current_macd > current_signal:
+                macd_analysis['crossover'] = True
+                confluence['bullish_signals'].append("🔥 MACD Bullish Crossover")
+            elif prev_macd >= prev_signal and current_macd < current_signal:
+                macd_analysis['crossover'] = True
+                confluence['bearish_signals'].append("🔥 MACD Bearish Crossover")
             
             confluence['indicator_analysis']['macd'] = macd_analysis
         
         # Moving Average Analysis
-        if all(key in indicators for key in ['sma_20', 'sma_50']):
-            current_sma20 = indicators['sma_20'].iloc[-1]
-            current_sma50 = indicators['sma_50'].iloc[-1]
+        if _MA_KEYS <= present:
+            current_sma20 = latest['sma_20']
+            current_sma50 = latest['sma_50']
             
             ma_analysis = {
                 'sma_20': current_sma20,
@@ -1676,29 +1964,23 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
             confluence['indicator_analysis']['moving_averages'] = ma_analysis
         
         # Volume Analysis
-        if 'volume_ratio' in indicators and not indicators['volume_ratio'].empty:
-            current_volume_ratio = indicators['volume_ratio'].iloc[-1]
+        if 'volume_ratio' in latest:
+            current_volume_ratio = latest['volume_ratio']
             
+            volume_band = band_index(current_volume_ratio, (0.7, 1.5))
+            signal, message = _VOLUME_SIGNALS[volume_band]
             volume_analysis = {
                 'volume_ratio': current_volume_ratio,
-                'signal': 'neutral'
+                'signal': signal
             }
-            
-            if current_volume_ratio > 1.5:
-                volume_analysis['signal'] = 'strong_interest'
-                confluence['bullish_signals'].append(f"📊 High Volume Confirmation ({current_volume_ratio:.1f}x)")
-            elif current_volume_ratio < 0.7:
-                volume_analysis['signal'] = 'low_interest'
-                confluence['neutral_signals'].append(f"📊 Low Volume ({current_volume_ratio:.1f}x)")
-            else:
-                confluence['neutral_signals'].append(f"📊 Average Volume ({current_volume_ratio:.1f}x)")
+            confluence[_VOLUME_SIGNAL_LISTS[volume_band]].append(message.format(current_volume_ratio))
             
             confluence['indicator_analysis']['volume'] = volume_analysis
         
         # Stochastic Analysis
-        if all(key in indicators for key in ['stoch_k', 'stoch_d']):
-            current_stoch_k = indicators['stoch_k'].iloc[-1]
-            current_stoch_d = indicators['stoch_d'].iloc[-1]
+        if _STOCH_KEYS <= present:
+            current_stoch_k = latest['stoch_k']
+            current_stoch_d = latest['stoch_d']
             
             stoch_analysis = {
                 'k': current_stoch_k,
@@ -1722,18 +2004,10 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
         
         if total_signals > 0:
             confluence['overall_score'] = ((bullish_count - bearish_count) / total_signals) * 100
-            
-            if confluence['overall_score'] > 30:
-                confluence['wave_alignment'] = 'bullish'
-            elif confluence['overall_score'] < -30:
-                confluence['wave_alignment'] = 'bearish'
-            else:
-                confluence['wave_alignment'] = 'neutral'
+            confluence['wave_alignment'] = _WAVE_ALIGNMENTS[band_index(confluence['overall_score'], _SCORE_BANDS)]
         
         # Wave Analysis Alignment
-        if wave_analysis:
-            wave_trend = determine_wave_trend_direction(wave_analysis.get('zigzag_pivots', []))
-            
+        if wave_trend is not None:
             if 'upward' in wave_trend and confluence['wave_alignment'] == 'bullish':
                 confluence['bullish_signals'].append("🎯 Elliott Wave & Technical Indicators Aligned (Bullish)")
             elif 'downward' in wave_trend and confluence['wave_alignment'] == 'bearish':
@@ -1748,6 +2022,66 @@ def analyze_indicator_confluence(indicators, current_price, wave_analysis):
     
     return confluence
 
+# Card gradients keyed by accent colour
+GRADIENTS = {color: f"linear-gradient(135deg, {color}22, {color}11)" for color in ('#28a745', '#ffc107', '#dc3545')}
+
+_CONFLUENCE_SCORE_CARD_TMPL = """
+<div class="price-card" style="background: {gradient}; border: 3px solid {color}; text-align: center;">
+    <h3 style="color: {color}; margin-bottom: 10px;">Technical Confluence Score</h3>
+    <h2 style="color: #212529; margin: 10px 0;">{score:+.0f}%</h2>
+    <h4 style="color: {color}; margin: 0;">{alignment} Bias</h4>
+</div>
+"""
+
+# Indicator card with the title in the signal colour (RSI, Stochastic)
+_INDICATOR_CARD_TMPL = """
+<div class="price-card" style="border-left: 4px solid {color};">
+    <h4 style="color: {color}; margin-bottom: 10px;">{title}</h4>
+    <h3 style="color: #212529; margin: 0;">{value}</h3>
+    <p style="color: #6c757d; margin: 5px 0 0 0;">{status}</p>
+</div>
+"""
+
+# Indicator card with the value in the signal colour (MA trend, Bollinger, volume)
+_STATUS_CARD_TMPL = """
+<div class="price-card" style="border-left: 4px solid {color};">
+    <h4 style="color: #6c757d; margin-bottom: 10px;">{title}</h4>
+    <h3 style="color: {color}; margin: 0;">{value}</h3>
+    <p style="color: #6c757d; margin: 5px 0 0 0;">{status}</p>
+</div>
+"""
+
+_MA_CARD_TMPL = """
+<div class="price-card" style="border-left: 4px solid {color};">
+    <h4 style="color: #6c757d; margin-bottom: 10px;">{title}</h4>
+    <h3 style="color: #212529; margin: 0;">${value:.2f}</h3>
+    <p style="color: {color}; margin: 5px 0 0 0;">
+        {position} Price
+    </p>
+</div>
+"""
+
+_MACD_CARD_TMPL = """
+<div class="price-card" style="border-left: 4px solid {color};">
+    <h4 style="color: {color}; margin-bottom: 10px;">MACD</h4>
+    <div style="display: flex; justify-content: space-between;">
+        <div>
+            <strong>MACD:</strong> {macd:.4f}<br>
+            <strong>Signal:</strong> {signal:.4f}
+        </div>
+        <div style="text-align: right;">
+            <h4 style="color: {color}; margin: 0;">{status}</h4>
+        </div>
+    </div>
+</div>
+"""
+
+_SIGNAL_SECTIONS = (
+    ('bullish_signals', "##### 📈 **Bullish Signals**"),
+    ('bearish_signals', "##### 📉 **Bearish Signals**"),
+    ('neutral_signals', "##### ➖ **Neutral/Mixed Signals**")
+)
+
 def display_technical_indicators(indicators, confluence, current_price):
     """Display technical indicators analysis with confluence"""
     
@@ -1757,21 +2091,20 @@ def display_technical_indicators(indicators, confluence, current_price):
     
     st.markdown("### 📊 **Technical Indicator Analysis**")
     
+    latest = {name: values[-1] for name, values in indicators.items() if len(values)}
+    present = latest.keys()
+    
     # Confluence Score
     if confluence and 'overall_score' in confluence:
         score = confluence['overall_score']
-        alignment = confluence['wave_alignment']
+        score_color = _SCORE_COLORS[band_index(score, _SCORE_BANDS)]
         
-        score_color = '#28a745' if score > 30 else '#dc3545' if score < -30 else '#ffc107'
-        alignment_text = alignment.title()
-        
-        st.markdown(f"""
-        <div class="price-card" style="background: linear-gradient(135deg, {score_color}22, {score_color}11); border: 3px solid {score_color}; text-align: center;">
-            <h3 style="color: {score_color}; margin-bottom: 10px;">Technical Confluence Score</h3>
-            <h2 style="color: #212529; margin: 10px 0;">{score:+.0f}%</h2>
-            <h4 style="color: {score_color}; margin: 0;">{alignment_text} Bias</h4>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_CONFLUENCE_SCORE_CARD_TMPL.format_map({
+            'gradient': GRADIENTS[score_color],
+            'color': score_color,
+            'score': score,
+            'alignment': confluence['wave_alignment'].title()
+        }), unsafe_allow_html=True)
     
     # Create tabs for different indicator categories
     tab1, tab2, tab3, tab4 = st.tabs(["📈 Momentum", "📊 Trend", "📉 Oscillators", "🔄 Confluence"])
@@ -1779,180 +2112,167 @@ def display_technical_indicators(indicators, confluence, current_price):
     with tab1:
         st.markdown("#### 🚀 Momentum Indicators")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # RSI
-            if 'rsi' in indicators and not indicators['rsi'].empty:
-                current_rsi = indicators['rsi'].iloc[-1]
-                rsi_color = '#dc3545' if current_rsi > 70 else '#28a745' if current_rsi < 30 else '#ffc107'
-                rsi_status = 'Overbought' if current_rsi > 70 else 'Oversold' if current_rsi < 30 else 'Neutral'
-                
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {rsi_color};">
-                    <h4 style="color: {rsi_color}; margin-bottom: 10px;">RSI (14)</h4>
-                    <h3 style="color: #212529; margin: 0;">{current_rsi:.1f}</h3>
-                    <p style="color: #6c757d; margin: 5px 0 0 0;">{rsi_status}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col2:
-            # Stochastic
-            if 'stoch_k' in indicators and not indicators['stoch_k'].empty:
-                current_stoch = indicators['stoch_k'].iloc[-1]
-                stoch_color = '#dc3545' if current_stoch > 80 else '#28a745' if current_stoch < 20 else '#ffc107'
-                stoch_status = 'Overbought' if current_stoch > 80 else 'Oversold' if current_stoch < 20 else 'Neutral'
-                
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {stoch_color};">
-                    <h4 style="color: {stoch_color}; margin-bottom: 10px;">Stochastic %K</h4>
-                    <h3 style="color: #212529; margin: 0;">{current_stoch:.1f}%</h3>
-                    <p style="color: #6c757d; margin: 5px 0 0 0;">{stoch_status}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        momentum_cards = []
+        
+        # RSI
+        if 'rsi' in latest:
+            current_rsi = latest['rsi']
+            rsi_band = band_index(current_rsi, _RSI_BANDS)
+            momentum_cards.append(_INDICATOR_CARD_TMPL.format_map({
+                'color': _OSCILLATOR_COLORS[rsi_band], 'title': 'RSI (14)', 'value': f"{current_rsi:.1f}",
+                'status': _OSCILLATOR_STATUS[rsi_band]
+            }))
+        
+        # Stochastic
+        if 'stoch_k' in latest:
+            current_stoch = latest['stoch_k']
+            stoch_band = band_index(current_stoch, _STOCH_BANDS)
+            momentum_cards.append(_INDICATOR_CARD_TMPL.format_map({
+                'color': _OSCILLATOR_COLORS[stoch_band], 'title': 'Stochastic %K', 'value': f"{current_stoch:.1f}%",
+                'status': _OSCILLATOR_STATUS[stoch_band]
+            }))
+        
+        if momentum_cards:
+            render_html_grid(momentum_cards, columns=2)
         
         # MACD
-        if all(key in indicators for key in ['macd', 'macd_signal']):
-            current_macd = indicators['macd'].iloc[-1]
-            current_signal = indicators['macd_signal'].iloc[-1]
-            macd_color = '#28a745' if current_macd > current_signal else '#dc3545'
-            macd_status = 'Bullish' if current_macd > current_signal else 'Bearish'
+        if _MACD_LINE_KEYS <= present:
+            current_macd = latest['macd']
+            current_signal = latest['macd_signal']
+            macd_bullish = int(current_macd > current_signal)
             
-            st.markdown(f"""
-            <div class="price-card" style="border-left: 4px solid {macd_color};">
-                <h4 style="color: {macd_color}; margin-bottom: 10px;">MACD</h4>
-                <div style="display: flex; justify-content: space-between;">
-                    <div>
-                        <strong>MACD:</strong> {current_macd:.4f}<br>
-                        <strong>Signal:</strong> {current_signal:.4f}
-                    </div>
-                    <div style="text-align: right;">
-                        <h4 style="color: {macd_color}; margin: 0;">{macd_status}</h4>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_MACD_CARD_TMPL.format_map({
+                'color': _TREND_COLORS[macd_bullish], 'macd': current_macd, 'signal': current_signal,
+                'status': _TREND_LABELS[macd_bullish]
+            }), unsafe_allow_html=True)
     
     with tab2:
         st.markdown("#### 📈 Trend Indicators")
         
         # Moving Averages
-        if 'sma_20' in indicators and 'sma_50' in indicators:
-            sma20 = indicators['sma_20'].iloc[-1]
-            sma50 = indicators['sma_50'].iloc[-1]
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                price_vs_sma20_color = '#28a745' if current_price > sma20 else '#dc3545'
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {price_vs_sma20_color};">
-                    <h4 style="color: #6c757d; margin-bottom: 10px;">SMA 20</h4>
-                    <h3 style="color: #212529; margin: 0;">${sma20:.2f}</h3>
-                    <p style="color: {price_vs_sma20_color}; margin: 5px 0 0 0;">
-                        {'Above' if current_price > sma20 else 'Below'} Price
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                price_vs_sma50_color = '#28a745' if current_price > sma50 else '#dc3545'
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {price_vs_sma50_color};">
-                    <h4 style="color: #6c757d; margin-bottom: 10px;">SMA 50</h4>
-                    <h3 style="color: #212529; margin: 0;">${sma50:.2f}</h3>
-                    <p style="color: {price_vs_sma50_color}; margin: 5px 0 0 0;">
-                        {'Above' if current_price > sma50 else 'Below'} Price
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                ma_trend_color = '#28a745' if sma20 > sma50 else '#dc3545'
-                ma_trend = 'Bullish' if sma20 > sma50 else 'Bearish'
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {ma_trend_color};">
-                    <h4 style="color: #6c757d; margin-bottom: 10px;">MA Trend</h4>
-                    <h3 style="color: {ma_trend_color}; margin: 0;">{ma_trend}</h3>
-                    <p style="color: #6c757d; margin: 5px 0 0 0;">SMA 20 vs 50</p>
-                </div>
-                """, unsafe_allow_html=True)
+        if _MA_KEYS <= present:
+            sma20 = latest['sma_20']
+            sma50 = latest['sma_50']
+            above_sma20 = int(current_price > sma20)
+            above_sma50 = int(current_price > sma50)
+            ma_bullish = int(sma20 > sma50)
+            
+            render_html_grid([
+                _MA_CARD_TMPL.format_map({
+                    'color': _TREND_COLORS[above_sma20], 'title': 'SMA 20', 'value': sma20,
+                    'position': _POSITION_LABELS[above_sma20]
+                }),
+                _MA_CARD_TMPL.format_map({
+                    'color': _TREND_COLORS[above_sma50], 'title': 'SMA 50', 'value': sma50,
+                    'position': _POSITION_LABELS[above_sma50]
+                }),
+                _STATUS_CARD_TMPL.format_map({
+                    'color': _TREND_COLORS[ma_bullish], 'title': 'MA Trend', 'value': _TREND_LABELS[ma_bullish],
+                    'status': 'SMA 20 vs 50'
+                })
+            ])
     
     with tab3:
         st.markdown("#### 📊 Oscillators & Volume")
         
+        oscillator_cards = []
+        
         # Bollinger Bands Position
-        if all(key in indicators for key in ['bb_upper', 'bb_lower', 'bb_middle']):
-            bb_upper = indicators['bb_upper'].iloc[-1]
-            bb_lower = indicators['bb_lower'].iloc[-1]
-            bb_middle = indicators['bb_middle'].iloc[-1]
+        if _BOLLINGER_KEYS <= present:
+            bb_upper = latest['bb_upper']
+            bb_lower = latest['bb_lower']
+            bb_middle = latest['bb_middle']
             
             bb_position = 'Upper' if current_price > bb_middle else 'Lower'
             bb_squeeze = (bb_upper - bb_lower) / bb_middle < 0.1
-            bb_color = '#dc3545' if current_price > bb_upper else '#28a745' if current_price < bb_lower else '#ffc107'
-            
-            col1, col2 = st.columns(2)
+            bb_color = _OSCILLATOR_COLORS[band_index(current_price, (bb_lower, bb_upper))]
             
-            with col1:
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {bb_color};">
-                    <h4 style="color: #6c757d; margin-bottom: 10px;">Bollinger Position</h4>
-                    <h3 style="color: {bb_color}; margin: 0;">{bb_position} Band</h3>
-                    <p style="color: #6c757d; margin: 5px 0 0 0;">
-                        {'Squeeze' if bb_squeeze else 'Normal'} Width
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+            oscillator_cards.append(_STATUS_CARD_TMPL.format_map({
+                'color': bb_color, 'title': 'Bollinger Position', 'value': f"{bb_position} Band",
+                'status': f"{'Squeeze' if bb_squeeze else 'Normal'} Width"
+            }))
         
         # Volume Analysis
-        if 'volume_ratio' in indicators:
-            volume_ratio = indicators['volume_ratio'].iloc[-1]
-            volume_color = '#28a745' if volume_ratio > 1.2 else '#ffc107' if volume_ratio > 0.8 else '#dc3545'
-            volume_status = 'High' if volume_ratio > 1.2 else 'Normal' if volume_ratio > 0.8 else 'Low'
+        if 'volume_ratio' in latest:
+            volume_ratio = latest['volume_ratio']
+            # Counting the thresholds exceeded keeps a NaN ratio in the 'Low' bucket
+            volume_level = int(volume_ratio > 0.8) + int(volume_ratio > 1.2)
             
-            with col2 if 'col2' in locals() else st.columns(1)[0]:
-                st.markdown(f"""
-                <div class="price-card" style="border-left: 4px solid {volume_color};">
-                    <h4 style="color: #6c757d; margin-bottom: 10px;">Volume</h4>
-                    <h3 style="color: {volume_color}; margin: 0;">{volume_ratio:.1f}x</h3>
-                    <p style="color: #6c757d; margin: 5px 0 0 0;">{volume_status} vs Average</p>
-                </div>
-                """, unsafe_allow_html=True)
+            oscillator_cards.append(_STATUS_CARD_TMPL.format_map({
+                'color': _VOLUME_COLORS[volume_level], 'title': 'Volume', 'value': f"{volume_ratio:.1f}x",
+                'status': f"{_VOLUME_STATUS[volume_level]} vs Average"
+            }))
+        
+        if oscillator_cards:
+            render_html_grid(oscillator_cards)
     
     with tab4:
         st.markdown("#### 🔄 Signal Confluence")
         
         if confluence:
-            # Bullish Signals
-            if confluence.get('bullish_signals'):
-                st.markdown("##### 📈 **Bullish Signals**")
-                for signal in confluence['bullish_signals']:
-                    st.markdown(f"- {signal}")
-            
-            # Bearish Signals  
-            if confluence.get('bearish_signals'):
-                st.markdown("##### 📉 **Bearish Signals**")
-                for signal in confluence['bearish_signals']:
-                    st.markdown(f"- {signal}")
-            
-            # Neutral/Mixed Signals
-            if confluence.get('neutral_signals'):
-                st.markdown("##### ➖ **Neutral/Mixed Signals**")
-                for signal in confluence['neutral_signals']:
-                    st.markdown(f"- {signal}")
+            # Bullish, bearish and neutral/mixed signal lists rendered as one markdown block
+            sections = [
+                heading + "\n" + "\n".join(f"- {signal}" for signal in confluence[key])
+                for key, heading in _SIGNAL_SECTIONS if confluence.get(key)
+            ]
+            if sections:
+                st.markdown("\n\n".join(sections))
+
+# Fibonacci bands for the wave rule guidelines. Bands are closed, so each upper bound is
+# nudged up by one ulp; a ratio in bucket i satisfies edges[i-1] <= ratio < edges[i].
+_WAVE_3_RATIO_EDGES = np.array([1.5, np.nextafter(1.7, np.inf), 2.5, np.nextafter(2.7, np.inf)])
+_WAVE_3_RATIO_LABELS = (
+    None,
+    'Wave 3 = {ratio:.2f} × Wave 1 (near 1.618 extension)',
+    None,
+    'Wave 3 = {ratio:.2f} × Wave 1 (near 2.618 extension)',
+    None
+)
+_WAVE_5_RATIO_EDGES = np.array([0.6, np.nextafter(0.65, np.inf), 0.9, np.nextafter(1.1, np.inf)])
+_WAVE_5_RATIO_LABELS = (
+    None,
+    'Wave 5 = {ratio:.2f} × Wave 1 (near 0.618)',
+    None,
+    'Wave 5 ≈ Wave 1 (ratio: {ratio:.2f})',
+    None
+)
+_DEEP_RETRACEMENT = 'Wave 2 retraces {percent:.1f}% (>80% is deep)'
+_WAVE_2_RETRACEMENT_EDGES = np.array([0.5, np.nextafter(0.65, np.inf), np.nextafter(0.8, np.inf)])
+_WAVE_2_RETRACEMENT_LABELS = (None, 'Wave 2 retraces {percent:.1f}% (healthy 50-61.8%)', None, _DEEP_RETRACEMENT)
+
+def fib_band_label(ratio, edges, labels):
+    """Message template for the Fibonacci band containing ratio, or None outside every band"""
+    return labels[int(np.searchsorted(edges, ratio, side='right'))]
 
 def validate_elliott_wave_rules(pivots, wave_labels=None):
     """Comprehensive Elliott Wave rule validation system"""
     
+    validation = {
+        'overall_validity': False,
+        'rule_violations': [],
+        'rule_confirmations': [],
+        'guidelines_check': [],
+        'educational_notes': [],
+        'validity_score': 0
+    }
+    
     if not pivots or len(pivots) < 5:
-        return {
-            'overall_validity': False,
-            'rule_violations': [],
-            'rule_confirmations': [],
-            'guidelines_check': [],
-            'educational_notes': [],
-            'validity_score': 0
-        }
+        return validation
+    
+    try:
+        # Only the first six pivots (start plus five wave ends) take part in the rules
+        wave_prices = tuple(float(pivot['price']) for pivot in pivots[:6])
+        validation, error = _validate_wave_rules(wave_prices)
+    except Exception as e:
+        error = str(e)
+    
+    if error:
+        st.error(f"Error in Elliott Wave validation: {error}")
+    return validation
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _validate_wave_rules(wave_prices):
+    """Rule and guideline checks for up to six pivot prices, returned with an error message or None"""
     
     validation = {
         'overall_validity': True,
@@ -1962,27 +2282,19 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
         'educational_notes': [],
         'validity_score': 0
     }
+    error = None
     
     try:
-        # Extract wave data for analysis
-        wave_prices = [pivot['price'] for pivot in pivots]
-        wave_times = [pivot.get('timestamp', i) for i, pivot in enumerate(pivots)]
+        wave_lengths = np.abs(np.diff(wave_prices)).tolist()
         
         # Assume we're analyzing a 5-wave impulse structure
         if len(wave_prices) >= 5:
-            wave_0 = wave_prices[0]  # Start
-            wave_1 = wave_prices[1]  # Wave 1 end
-            wave_2 = wave_prices[2]  # Wave 2 end
-            wave_3 = wave_prices[3]  # Wave 3 end
-            wave_4 = wave_prices[4]  # Wave 4 end
+            wave_0, wave_1, wave_2, wave_3, wave_4 = wave_prices[:5]  # Start and wave 1-4 ends
             wave_5 = wave_prices[5] if len(wave_prices) > 5 else None  # Wave 5 end
             
-            # Calculate wave lengths
-            wave_1_length = abs(wave_1 - wave_0)
-            wave_2_length = abs(wave_2 - wave_1)
-            wave_3_length = abs(wave_3 - wave_2)
-            wave_4_length = abs(wave_4 - wave_3)
-            wave_5_length = abs(wave_5 - wave_4) if wave_5 else None
+            # Wave lengths from consecutive pivot differences
+            wave_1_length, wave_2_length, wave_3_length, wave_4_length = wave_lengths[:4]
+            wave_5_length = wave_lengths[4] if wave_5 else None
             
             # RULE 1: Wave 3 is never the shortest impulse wave
             rule1_valid = True
@@ -2000,7 +2312,8 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
                 validation['guidelines_check'].append({
                     'guideline': 'Wave 3 Length Concern',
                     'description': f'Wave 3 ({wave_3_length:.2f}) is shorter than Wave 1 ({wave_1_length:.2f})',
-                    'note': 'Monitor Wave 5 completion - ensure Wave 3 is not the shortest when pattern completes'
+                    'note': 'Monitor Wave 5 completion - ensure Wave 3 is not the shortest when pattern completes',
+                    'is_positive': False
                 })
             
             if rule1_valid:
@@ -2015,8 +2328,8 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
             is_uptrend = wave_1 > wave_0
             
             if is_uptrend:
-                # In uptrend: Wave 4 low cannot go below Wave 1 high
-                wave_1_high = max(wave_0, wave_1)
+                # In uptrend: Wave 4 low cannot go below Wave 1 high (wave_1 > wave_0 here)
+                wave_1_high = wave_1
                 wave_4_low = min(wave_3, wave_4)
                 if wave_4_low < wave_1_high:
                     rule2_valid = False
@@ -2029,8 +2342,8 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
                         'suggestion': 'This suggests the pattern may be a diagonal (wedge) rather than a standard impulse, or the wave count needs revision.'
                     })
             else:
-                # In downtrend: Wave 4 high cannot go above Wave 1 low
-                wave_1_low = min(wave_0, wave_1)
+                # In downtrend: Wave 4 high cannot go above Wave 1 low (wave_1 <= wave_0 here)
+                wave_1_low = wave_1
                 wave_4_high = max(wave_3, wave_4)
                 if wave_4_high > wave_1_low:
                     rule2_valid = False
@@ -2051,7 +2364,7 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
             
             # RULE 3: Wave 2 cannot retrace more than 100% of Wave 1
             rule3_valid = True
-            wave_2_retracement = abs(wave_2 - wave_1) / wave_1_length if wave_1_length > 0 else 0
+            wave_2_retracement = wave_2_length / wave_1_length if wave_1_length > 0 else 0
             
             if wave_2_retracement > 1.0:
                 rule3_valid = False
@@ -2074,65 +2387,64 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
             # Wave 3 often extends to 1.618 of Wave 1
             if wave_1_length > 0:
                 wave_3_ratio = wave_3_length / wave_1_length
-                if 1.5 <= wave_3_ratio <= 1.7:
-                    fib_relationships.append(f'Wave 3 = {wave_3_ratio:.2f} × Wave 1 (near 1.618 extension)')
-                elif 2.5 <= wave_3_ratio <= 2.7:
-                    fib_relationships.append(f'Wave 3 = {wave_3_ratio:.2f} × Wave 1 (near 2.618 extension)')
+                label = fib_band_label(wave_3_ratio, _WAVE_3_RATIO_EDGES, _WAVE_3_RATIO_LABELS)
+                if label:
+                    fib_relationships.append(label.format(ratio=wave_3_ratio))
             
             # Wave 5 often equals Wave 1 or relates by Fibonacci
             if wave_5_length and wave_1_length > 0:
                 wave_5_ratio = wave_5_length / wave_1_length
-                if 0.9 <= wave_5_ratio <= 1.1:
-                    fib_relationships.append(f'Wave 5 ≈ Wave 1 (ratio: {wave_5_ratio:.2f})')
-                elif 0.6 <= wave_5_ratio <= 0.65:
-                    fib_relationships.append(f'Wave 5 = {wave_5_ratio:.2f} × Wave 1 (near 0.618)')
+                label = fib_band_label(wave_5_ratio, _WAVE_5_RATIO_EDGES, _WAVE_5_RATIO_LABELS)
+                if label:
+                    fib_relationships.append(label.format(ratio=wave_5_ratio))
             
             # Wave 2 and 4 retracement guidelines
             if wave_2_retracement > 0:
-                if 0.5 <= wave_2_retracement <= 0.65:
-                    fib_relationships.append(f'Wave 2 retraces {wave_2_retracement*100:.1f}% (healthy 50-61.8%)')
-                elif wave_2_retracement > 0.8:
+                label = fib_band_label(wave_2_retracement, _WAVE_2_RETRACEMENT_EDGES, _WAVE_2_RETRACEMENT_LABELS)
+                if label == _DEEP_RETRACEMENT:
                     validation['guidelines_check'].append({
                         'guideline': 'Deep Wave 2 Retracement',
-                        'description': f'Wave 2 retraces {wave_2_retracement*100:.1f}% (>80% is deep)',
-                        'note': 'Deep retracements are valid but suggest strong correction'
+                        'description': label.format(percent=wave_2_retracement * 100),
+                        'note': 'Deep retracements are valid but suggest strong correction',
+                        'is_positive': False
                     })
+                elif label:
+                    fib_relationships.append(label.format(percent=wave_2_retracement * 100))
             
             if fib_relationships:
                 validation['guidelines_check'].extend([{
                     'guideline': 'Fibonacci Relationships',
                     'description': rel,
-                    'note': 'Strong Fibonacci relationships increase pattern validity'
+                    'note': 'Strong Fibonacci relationships increase pattern validity',
+                    'is_positive': True
                 } for rel in fib_relationships])
             
             # GUIDELINE: Alternation principle
             # Wave 2 and Wave 4 should alternate in form
             wave_2_type = 'sharp' if wave_2_retracement > 0.618 else 'sideways'
             
-            if len(wave_times) >= 5:
-                wave_2_time = abs(wave_times[2] - wave_times[1]) if len(wave_times) > 2 else 1
-                wave_4_time = abs(wave_times[4] - wave_times[3]) if len(wave_times) > 4 else 1
-                
-                wave_4_retracement = abs(wave_4 - wave_3) / wave_3_length if wave_3_length > 0 else 0
-                wave_4_type = 'sharp' if wave_4_retracement > 0.618 else 'sideways'
-                
-                if wave_2_type != wave_4_type:
-                    validation['guidelines_check'].append({
-                        'guideline': 'Alternation Principle ✅',
-                        'description': f'Wave 2 is {wave_2_type}, Wave 4 is {wave_4_type} (alternating forms)',
-                        'note': 'Alternation strengthens the wave count validity'
-                    })
-                else:
-                    validation['guidelines_check'].append({
-                        'guideline': 'Alternation Concern',
-                        'description': f'Both Wave 2 and Wave 4 appear {wave_2_type}',
-                        'note': 'Lack of alternation weakens the pattern (guideline, not rule)'
-                    })
+            wave_4_retracement = wave_4_length / wave_3_length if wave_3_length > 0 else 0
+            wave_4_type = 'sharp' if wave_4_retracement > 0.618 else 'sideways'
+            
+            if wave_2_type != wave_4_type:
+                validation['guidelines_check'].append({
+                    'guideline': 'Alternation Principle ✅',
+                    'description': f'Wave 2 is {wave_2_type}, Wave 4 is {wave_4_type} (alternating forms)',
+                    'note': 'Alternation strengthens the wave count validity',
+                    'is_positive': True
+                })
+            else:
+                validation['guidelines_check'].append({
+                    'guideline': 'Alternation Concern',
+                    'description': f'Both Wave 2 and Wave 4 appear {wave_2_type}',
+                    'note': 'Lack of alternation weakens the pattern (guideline, not rule)',
+                    'is_positive': False
+                })
             
             # Calculate overall validity score
-            critical_violations = len([v for v in validation['rule_violations'] if v.get('severity') == 'critical'])
+            critical_violations = sum(v.get('severity') == 'critical' for v in validation['rule_violations'])
             confirmations = len(validation['rule_confirmations'])
-            guidelines_met = len([g for g in validation['guidelines_check'] if '✅' in g.get('description', '')])
+            guidelines_met = sum(g['is_positive'] for g in validation['guidelines_check'])
             
             if critical_violations > 0:
                 validation['overall_validity'] = False
@@ -2155,11 +2467,59 @@ def validate_elliott_wave_rules(pivots, wave_labels=None):
             validation['validity_score'] = 20
     
     except Exception as e:
-        st.error(f"Error in Elliott Wave validation: {str(e)}")
+        error = str(e)
         validation['overall_validity'] = False
         validation['validity_score'] = 0
     
-    return validation
+    return validation, error
+
+_VALIDITY_CARD_TMPL = """
+<div class="price-card" style="background: {gradient}; border: 3px solid {color}; text-align: center;">
+    <h3 style="color: {color}; margin-bottom: 10px;">Wave Count Validity</h3>
+    <h1 style="color: #212529; margin: 10px 0; font-size: 2.5em;">{icon} {score:.0f}%</h1>
+    <h4 style="color: {color}; margin: 0;">{validity} - {grade}</h4>
+</div>
+"""
+
+_VIOLATION_CARD_TMPL = """
+<details open style="margin: 10px 0;">
+    <summary style="cursor: pointer; font-weight: bold;">❌ {rule}</summary>
+    <div class="price-card" style="border: 2px solid {color}; background-color: {color}22;">
+        <h4 style="color: {color}; margin-bottom: 10px;">⚠️ {rule}</h4>
+        <p style="margin-bottom: 10px;"><strong>Issue:</strong> {description}</p>
+        <p style="margin-bottom: 10px;"><strong>Explanation:</strong> {explanation}</p>
+        <p style="margin: 0;"><strong>Suggestion:</strong> {suggestion}</p>
+    </div>
+</details>
+"""
+
+_CONFIRMATION_CARD_TMPL = """
+<div class="price-card" style="border-left: 4px solid #28a745; background-color: #d4edda;">
+    <h5 style="color: #155724; margin-bottom: 5px;">{rule}</h5>
+    <p style="color: #155724; margin: 0;">{description}</p>
+</div>
+"""
+
+_GUIDELINE_STRENGTH_TMPL = """
+<div class="price-card" style="border-left: 3px solid #28a745; padding: 10px; margin: 5px 0;">
+    <strong>{guideline}</strong><br>
+    <small>{description}</small>
+</div>
+"""
+
+_GUIDELINE_CONCERN_TMPL = """
+<div class="price-card" style="border-left: 3px solid #ffc107; padding: 10px; margin: 5px 0;">
+    <strong>{guideline}</strong><br>
+    <small>{description}</small><br>
+    <em style="color: #6c757d;">{note}</em>
+</div>
+"""
+
+_VALIDATION_RESOURCES = """**Additional Resources:**
+
+- Elliott Wave Principle by Frost & Prechter (definitive guide)
+- Elliott Wave rules are universal and apply to all timeframes
+- Guidelines increase probability but are not absolute requirements"""
 
 def display_wave_validation(validation_results):
     """Display Elliott Wave rule validation results"""
@@ -2173,6 +2533,10 @@ def display_wave_validation(validation_results):
     # Overall Validity Score
     validity_score = validation_results.get('validity_score', 0)
     is_valid = validation_results.get('overall_validity', False)
+    violations = validation_results.get('rule_violations') or ()
+    confirmations = validation_results.get('rule_confirmations') or ()
+    guidelines = validation_results.get('guidelines_check') or ()
+    notes = validation_results.get('educational_notes') or ()
     
     score_color = '#28a745' if validity_score >= 80 else '#ffc107' if validity_score >= 60 else '#dc3545'
     validity_text = 'Valid' if is_valid else 'Invalid'
@@ -2190,107 +2554,98 @@ def display_wave_validation(validation_results):
         grade_text = 'Poor'
         grade_icon = '❌'
     
-    st.markdown(f"""
-    <div class="price-card" style="background: linear-gradient(135deg, {score_color}22, {score_color}11); border: 3px solid {score_color}; text-align: center;">
-        <h3 style="color: {score_color}; margin-bottom: 10px;">Wave Count Validity</h3>
-        <h1 style="color: #212529; margin: 10px 0; font-size: 2.5em;">{grade_icon} {validity_score:.0f}%</h1>
-        <h4 style="color: {score_color}; margin: 0;">{validity_text} - {grade_text}</h4>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_VALIDITY_CARD_TMPL.format(
+        gradient=GRADIENTS[score_color], color=score_color, icon=grade_icon, score=validity_score,
+        validity=validity_text, grade=grade_text
+    ), unsafe_allow_html=True)
     
     # Rule Violations (Critical Issues)
-    if validation_results.get('rule_violations'):
+    if violations:
         st.markdown("#### 🚨 **Critical Rule Violations**")
         
-        for violation in validation_results['rule_violations']:
-            severity_color = '#dc3545' if violation.get('severity') == 'critical' else '#ffc107'
-            
-            with st.expander(f"❌ {violation['rule']}", expanded=True):
-                st.markdown(f"""
-                <div class="price-card" style="border: 2px solid {severity_color}; background-color: {severity_color}22;">
-                    <h4 style="color: {severity_color}; margin-bottom: 10px;">⚠️ {violation['rule']}</h4>
-                    <p style="margin-bottom: 10px;"><strong>Issue:</strong> {violation['description']}</p>
-                    <p style="margin-bottom: 10px;"><strong>Explanation:</strong> {violation['explanation']}</p>
-                    <p style="margin: 0;"><strong>Suggestion:</strong> {violation['suggestion']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        # Each violation is an open <details> block so the whole section is one markdown call
+        st.markdown("".join(
+            _VIOLATION_CARD_TMPL.format_map({
+                **violation, 'color': '#dc3545' if violation.get('severity') == 'critical' else '#ffc107'
+            }).strip()
+            for violation in violations
+        ), unsafe_allow_html=True)
     
     # Rule Confirmations
-    if validation_results.get('rule_confirmations'):
+    if confirmations:
         st.markdown("#### ✅ **Rule Confirmations**")
         
-        for confirmation in validation_results['rule_confirmations']:
-            st.markdown(f"""
-            <div class="price-card" style="border-left: 4px solid #28a745; background-color: #d4edda;">
-                <h5 style="color: #155724; margin-bottom: 5px;">{confirmation['rule']}</h5>
-                <p style="color: #155724; margin: 0;">{confirmation['description']}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown("".join(
+            _CONFIRMATION_CARD_TMPL.format_map(confirmation).strip()
+            for confirmation in confirmations
+        ), unsafe_allow_html=True)
     
     # Guidelines Check
-    if validation_results.get('guidelines_check'):
+    if guidelines:
         st.markdown("#### 📋 **Guidelines Assessment**")
         
         col1, col2 = st.columns(2)
         
-        positive_guidelines = [g for g in validation_results['guidelines_check'] if '✅' in g.get('description', '')]
-        concerns = [g for g in validation_results['guidelines_check'] if '✅' not in g.get('description', '')]
+        # Split met guidelines from concerns in one pass
+        positive_guidelines, concerns = [], []
+        for guideline in guidelines:
+            (positive_guidelines if guideline['is_positive'] else concerns).append(guideline)
         
         with col1:
             if positive_guidelines:
                 st.markdown("##### 💪 **Strengths**")
-                for guideline in positive_guidelines:
-                    st.markdown(f"""
-                    <div class="price-card" style="border-left: 3px solid #28a745; padding: 10px; margin: 5px 0;">
-                        <strong>{guideline['guideline']}</strong><br>
-                        <small>{guideline['description']}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown("".join(
+                    _GUIDELINE_STRENGTH_TMPL.format_map(guideline).strip() for guideline in positive_guidelines
+                ), unsafe_allow_html=True)
         
         with col2:
             if concerns:
                 st.markdown("##### ⚠️ **Areas of Concern**")
-                for concern in concerns:
-                    st.markdown(f"""
-                    <div class="price-card" style="border-left: 3px solid #ffc107; padding: 10px; margin: 5px 0;">
-                        <strong>{concern['guideline']}</strong><br>
-                        <small>{concern['description']}</small><br>
-                        <em style="color: #6c757d;">{concern.get('note', '')}</em>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown("".join(
+                    _GUIDELINE_CONCERN_TMPL.format_map({'note': '', **concern}).strip() for concern in concerns
+                ), unsafe_allow_html=True)
     
     # Educational Notes
-    if validation_results.get('educational_notes'):
+    if notes:
         with st.expander("📚 **Educational Notes - Elliott Wave Theory**", expanded=False):
-            for note in validation_results['educational_notes']:
-                st.markdown(f"- {note}")
+            st.markdown("\n".join(f"- {note}" for note in notes))
             
             st.markdown("---")
-            st.markdown("**Additional Resources:**")
-            st.markdown("- Elliott Wave Principle by Frost & Prechter (definitive guide)")
-            st.markdown("- Elliott Wave rules are universal and apply to all timeframes")
-            st.markdown("- Guidelines increase probability but are not absolute requirements")
+            st.markdown(_VALIDATION_RESOURCES)
+
+def script_run_executor(max_workers):
+    """Thread pool whose workers share the current script run context"""
+    # Worker threads need this run's context so cached calls and fetch errors still reach the page
+    ctx = get_script_run_ctx()
+    
+    def attach_context():
+        add_script_run_ctx(threading.current_thread(), ctx)
+    
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=attach_context)
 
-def create_multi_timeframe_analysis(ticker, timeframes=['daily', '4h', '1h']):
+# (range period, ZigZag threshold) per timeframe; anything else uses the hourly settings
+_TIMEFRAME_SETTINGS = {
+    'daily': ('2y', 4.0),
+    '4h': ('6mo', 2.5)
+}
+_DEFAULT_TIMEFRAME_SETTINGS = ('3mo', 1.5)
+
+def create_multi_timeframe_analysis(ticker, timeframes=('daily', '4h', '1h')):
     """Create multi-timeframe Elliott Wave analysis"""
     
     multi_analysis = {}
+    settings = [_TIMEFRAME_SETTINGS.get(tf, _DEFAULT_TIMEFRAME_SETTINGS) for tf in timeframes]
+    
+    # Download all timeframes at once; analysis runs here in timeframe order
+    with script_run_executor(max(1, min(8, len(timeframes)))) as executor:
+        downloads = [
+            executor.submit(fetch_stock_data, ticker, tf, range_period)
+            for tf, (range_period, _) in zip(timeframes, settings)
+        ]
     
-    for tf in timeframes:
+    for tf, (_, threshold), download in zip(timeframes, settings, downloads):
         try:
-            # Adjust range based on timeframe
-            if tf == 'daily':
-                range_period = '2y'
-                threshold = 4.0
-            elif tf == '4h':
-                range_period = '6mo'  
-                threshold = 2.5
-            else:  # 1h
-                range_period = '3mo'
-                threshold = 1.5
-                
-            # Fetch data
-            df = fetch_stock_data(ticker, tf, range_period)
+            df = download.result()
             
             if not df.empty:
                 # Analyze waves
@@ -2306,6 +2661,61 @@ def create_multi_timeframe_analysis(ticker, timeframes=['daily', '4h', '1h']):
             
     return multi_analysis
 
+# Price target and support/resistance card; wave targets use a neutral title with a direction-coloured border
+_LEVEL_CARD_TMPL = """
+<div style="
+    background-color: {background};
+    border: 2px solid {border};
+    border-radius: 8px;
+    padding: 15px;
+    margin: 10px 0;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+">
+    <h4 style="color: {title_color}; margin: 0 0 5px 0; font-size: 16px;">{title}</h4>
+    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${level:.2f}</h3>
+    <p style="color: {border}; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
+    <small style="color: #6c757d;">{note}</small>
+</div>
+"""
+
+# (key, title, note) per column of the wave target cards
+_WAVE_TARGET_COLUMNS = (
+    (
+        ('wave_3_target', "🎯 Wave 3 Target", "Primary Wave 3 target (1.618x Wave 1)"),
+        ('wave_5_target', "🏁 Wave 5 Target", "Wave 5 target (equality with Wave 1)")
+    ),
+    (
+        ('wave_3_extension', "🚀 Wave 3 Extension", "Extended Wave 3 target (2.618x Wave 1)"),
+        ('wave_5_extension', "🎯 Wave 5 Extension", "Extended Wave 5 target")
+    )
+)
+
+# (key, title, note, background, accent) per column of the support/resistance cards
+_SUPPORT_RESISTANCE_COLUMNS = (
+    (
+        ('major_support', "🔻 Major Support", "Strong support level from pivots", '#fff3cd', '#856404'),
+        ('immediate_support', "📉 Immediate Support", "Nearest support level", '#f8d7da', '#721c24')
+    ),
+    (
+        ('major_resistance', "🔺 Major Resistance", "Strong resistance level from pivots", '#d1ecf1', '#0c5460'),
+        ('immediate_resistance', "📈 Immediate Resistance", "Nearest resistance level", '#d4edda', '#155724')
+    )
+)
+
+def render_target_card(title, level, current_price, note, background=None, accent=None):
+    """Level card HTML; without an accent the border follows the level's direction from the current price"""
+    distance = ((level - current_price) / current_price) * 100
+    border = accent or ("#28a745" if distance > 0 else "#dc3545")
+    return _LEVEL_CARD_TMPL.format(
+        background=background or '#f8f9fa',
+        border=border,
+        title_color=accent or '#343a40',
+        title=title,
+        level=level,
+        distance=distance,
+        note=note
+    ).strip()
+
 def display_price_targets(targets, current_price):
     """Display price targets in an organized format with better visibility"""
     
@@ -2320,94 +2730,13 @@ def display_price_targets(targets, current_price):
     if wave_targets:
         st.markdown("**📈 Elliott Wave Price Targets:**")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if 'wave_3_target' in wave_targets:
-                target = wave_targets['wave_3_target']
-                distance = ((target - current_price) / current_price) * 100
-                
-                # Create custom styled card
-                color = "#28a745" if distance > 0 else "#dc3545"
-                st.markdown(f"""
-                <div style="
-                    background-color: #f8f9fa;
-                    border: 2px solid {color};
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #343a40; margin: 0 0 5px 0; font-size: 16px;">🎯 Wave 3 Target</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${target:.2f}</h3>
-                    <p style="color: {color}; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Primary Wave 3 target (1.618x Wave 1)</small>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            if 'wave_5_target' in wave_targets:
-                target = wave_targets['wave_5_target'] 
-                distance = ((target - current_price) / current_price) * 100
-                
-                color = "#28a745" if distance > 0 else "#dc3545"
-                st.markdown(f"""
-                <div style="
-                    background-color: #f8f9fa;
-                    border: 2px solid {color};
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #343a40; margin: 0 0 5px 0; font-size: 16px;">🏁 Wave 5 Target</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${target:.2f}</h3>
-                    <p style="color: {color}; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Wave 5 target (equality with Wave 1)</small>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col2:
-            if 'wave_3_extension' in wave_targets:
-                target = wave_targets['wave_3_extension']
-                distance = ((target - current_price) / current_price) * 100
-                
-                color = "#28a745" if distance > 0 else "#dc3545"
-                st.markdown(f"""
-                <div style="
-                    background-color: #f8f9fa;
-                    border: 2px solid {color};
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #343a40; margin: 0 0 5px 0; font-size: 16px;">🚀 Wave 3 Extension</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${target:.2f}</h3>
-                    <p style="color: {color}; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Extended Wave 3 target (2.618x Wave 1)</small>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            if 'wave_5_extension' in wave_targets:
-                target = wave_targets['wave_5_extension']
-                distance = ((target - current_price) / current_price) * 100
-                
-                color = "#28a745" if distance > 0 else "#dc3545"
-                st.markdown(f"""
-                <div style="
-                    background-color: #f8f9fa;
-                    border: 2px solid {color};
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #343a40; margin: 0 0 5px 0; font-size: 16px;">🎯 Wave 5 Extension</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${target:.2f}</h3>
-                    <p style="color: {color}; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Extended Wave 5 target</small>
-                </div>
-                """, unsafe_allow_html=True)
+        for column, specs in zip(st.columns(2), _WAVE_TARGET_COLUMNS):
+            cards = [
+                render_target_card(title, wave_targets[key], current_price, note)
+                for key, title, note in specs if key in wave_targets
+            ]
+            if cards:
+                column.markdown("".join(cards), unsafe_allow_html=True)
     
     # Support/Resistance with custom styling
     sr_levels = targets.get('support_resistance', {})
@@ -2415,156 +2744,94 @@ def display_price_targets(targets, current_price):
         st.markdown("---")
         st.markdown("**🛡️ Support & Resistance Levels:**")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if 'major_support' in sr_levels:
-                level = sr_levels['major_support']
-                distance = ((level - current_price) / current_price) * 100
-                
-                st.markdown(f"""
-                <div style="
-                    background-color: #fff3cd;
-                    border: 2px solid #856404;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #856404; margin: 0 0 5px 0; font-size: 16px;">🔻 Major Support</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${level:.2f}</h3>
-                    <p style="color: #856404; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Strong support level from pivots</small>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            if 'immediate_support' in sr_levels:
-                level = sr_levels['immediate_support']
-                distance = ((level - current_price) / current_price) * 100
-                
-                st.markdown(f"""
-                <div style="
-                    background-color: #f8d7da;
-                    border: 2px solid #721c24;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #721c24; margin: 0 0 5px 0; font-size: 16px;">📉 Immediate Support</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${level:.2f}</h3>
-                    <p style="color: #721c24; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Nearest support level</small>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col2:
-            if 'major_resistance' in sr_levels:
-                level = sr_levels['major_resistance']
-                distance = ((level - current_price) / current_price) * 100
-                
-                st.markdown(f"""
-                <div style="
-                    background-color: #d1ecf1;
-                    border: 2px solid #0c5460;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #0c5460; margin: 0 0 5px 0; font-size: 16px;">🔺 Major Resistance</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${level:.2f}</h3>
-                    <p style="color: #0c5460; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Strong resistance level from pivots</small>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            if 'immediate_resistance' in sr_levels:
-                level = sr_levels['immediate_resistance']
-                distance = ((level - current_price) / current_price) * 100
-                
-                st.markdown(f"""
-                <div style="
-                    background-color: #d4edda;
-                    border: 2px solid #155724;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                ">
-                    <h4 style="color: #155724; margin: 0 0 5px 0; font-size: 16px;">📈 Immediate Resistance</h4>
-                    <h3 style="color: #212529; margin: 0; font-size: 24px; font-weight: bold;">${level:.2f}</h3>
-                    <p style="color: #155724; margin: 5px 0 0 0; font-size: 16px; font-weight: bold;">{distance:+.1f}%</p>
-                    <small style="color: #6c757d;">Nearest resistance level</small>
-                </div>
-                """, unsafe_allow_html=True)
+        for column, specs in zip(st.columns(2), _SUPPORT_RESISTANCE_COLUMNS):
+            cards = [
+                render_target_card(title, sr_levels[key], current_price, note, background, accent)
+                for key, title, note, background, accent in specs if key in sr_levels
+            ]
+            if cards:
+                column.markdown("".join(cards), unsafe_allow_html=True)
+
+# Price downloads are network-bound, so the scanner overlaps them across a small thread pool
+SCAN_MAX_WORKERS = 16
+
+def _scan_one(symbol, df, threshold):
+    """Analyze one symbol's price data for the scanner; None when no usable pattern is found"""
+    # Symbols without enough swings for a wave count are skipped before the full analysis
+    if df.empty or count_zigzag_pivots(df, pct_threshold=threshold) < 5:
+        return None
+    
+    # Analyze waves
+    analysis = analyze_elliott_waves(df, threshold)
+    
+    # Check if we have any wave analysis results
+    if not analysis or len(analysis.get('zigzag_pivots', [])) < 5:
+        return None
+    
+    # analyze_elliott_waves always returns the primary count as a plain dict
+    primary = analysis['primary_count']
+    score = primary.get('confidence_score', 0)
+    pattern = primary.get('pattern_type', 'Elliott Wave Pattern')
+    
+    # If no confidence score found, calculate based on pivots
+    if score == 0:
+        pivot_count = len(analysis.get('zigzag_pivots', []))
+        score = min(pivot_count * 10, 85)  # Base score on number of pivots
+    
+    current_price = df['close'].iat[-1]
+    
+    # Calculate price targets
+    targets = calculate_price_targets(analysis, current_price)
+    
+    # Add any pattern with at least 5 pivots (minimum for Elliott Wave)
+    return {
+        'symbol': symbol,
+        'confidence': score,
+        'pattern': pattern,
+        'current_price': current_price,
+        'analysis': analysis,
+        'targets': targets,
+        'pivot_count': len(analysis.get('zigzag_pivots', []))
+    }
+
+def _fetch_and_scan(symbol, timeframe, threshold):
+    """Download one symbol's scanner history and analyze it on the calling worker thread"""
+    return _scan_one(symbol, fetch_stock_data(symbol, timeframe, '1y'), threshold)
 
 def scan_multiple_stocks(symbols, timeframe='daily', threshold=4.0):
     """Scan multiple stocks for Elliott Wave patterns"""
     
-    results = []
+    results = [None] * len(symbols)
     
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, symbol in enumerate(symbols):
-        try:
-            status_text.text(f"Analyzing {symbol}... ({i+1}/{len(symbols)})")
-            progress_bar.progress((i + 1) / len(symbols))
-            
-            # Fetch data
-            df = fetch_stock_data(symbol, timeframe, '1y')
-            
-            if not df.empty:
-                # Analyze waves
-                analysis = analyze_elliott_waves(df, threshold)
+    # Each worker downloads and analyzes its symbol, so analysis overlaps the remaining downloads and
+    # the ZigZag kernel runs without the GIL; this thread only reports progress
+    with script_run_executor(SCAN_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(_fetch_and_scan, symbol, timeframe, threshold): i
+            for i, symbol in enumerate(symbols)
+        }
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            symbol = symbols[i]
+            try:
+                status_text.text(f"Analyzed {symbol} ({done}/{len(symbols)})")
+                progress_bar.progress(done / len(symbols))
                 
-                # Check if we have any wave analysis results
-                if analysis and len(analysis.get('zigzag_pivots', [])) >= 5:
-                    primary = analysis.get('primary_count', {})
-                    
-                    # Be more flexible with pattern detection
-                    score = 0
-                    pattern = 'Elliott Wave Pattern'
-                    
-                    # Try to get confidence score from different sources
-                    if isinstance(primary, dict):
-                        score = primary.get('confidence_score', 0)
-                        pattern = primary.get('pattern_type', 'Elliott Wave Pattern')
-                    else:
-                        # If primary is an object
-                        score = getattr(primary, 'confidence_score', 0) if hasattr(primary, 'confidence_score') else 0
-                        pattern = getattr(primary, 'pattern_type', 'Elliott Wave Pattern') if hasattr(primary, 'pattern_type') else 'Elliott Wave Pattern'
-                    
-                    # If no confidence score found, calculate based on pivots
-                    if score == 0:
-                        pivot_count = len(analysis.get('zigzag_pivots', []))
-                        score = min(pivot_count * 10, 85)  # Base score on number of pivots
-                    
-                    current_price = df['close'].iloc[-1] if not df.empty else 0
-                    
-                    # Calculate price targets
-                    targets = calculate_price_targets(analysis, current_price)
-                    
-                    # Add any pattern with at least 5 pivots (minimum for Elliott Wave)
-                    results.append({
-                        'symbol': symbol,
-                        'confidence': score,
-                        'pattern': pattern,
-                        'current_price': current_price,
-                        'analysis': analysis,
-                        'targets': targets,
-                        'pivot_count': len(analysis.get('zigzag_pivots', []))
-                    })
-                    
-        except Exception as e:
-            st.warning(f"Could not analyze {symbol}: {str(e)}")
-            continue
+                results[i] = future.result()
+            
+            except Exception as e:
+                st.warning(f"Could not analyze {symbol}: {str(e)}")
+                continue
     
     progress_bar.empty()
     status_text.empty()
     
-    return results
+    # Keep the input symbol order regardless of download completion order
+    return [result for result in results if result is not None]
 
 def display_scanner_results(scan_results):
     """Display pattern scanner results in organized format"""
@@ -2574,7 +2841,7 @@ def display_scanner_results(scan_results):
         return
     
     # Sort by confidence score
-    scan_results.sort(key=lambda x: x['confidence'], reverse=True)
+    scan_results.sort(key=itemgetter('confidence'), reverse=True)
     
     st.subheader(f"🔍 Pattern Scanner Results ({len(scan_results)} symbols analyzed)")
     
@@ -2691,6 +2958,63 @@ def display_scanner_results(scan_results):
                 st.markdown(summary)# Initialize database
 init_db()
 
+@st.cache_resource(show_spinner=False)
+def warm_up_kernels():
+    """Compile (or load from Numba's on-disk cache) the analysis kernels once per server process"""
+    if not NUMBA_AVAILABLE:
+        return
+    # Built like a fetched frame (float prices, integer volume) so the first Analyze click reuses these specializations
+    prices = np.linspace(100.0, 110.0, 64)
+    frame = pd.DataFrame({
+        'high': prices + 1.0,
+        'low': prices - 1.0,
+        'close': prices,
+        'volume': np.full(len(prices), 1000, dtype=np.int64)
+    })
+    detect_zigzag(frame, pct_threshold=4.0)
+    compute_indicators(frame['close'].to_numpy(), frame['high'].to_numpy(), frame['low'].to_numpy(), frame['volume'].to_numpy())
+
+warm_up_kernels()
+
+# Detail tables keep numeric columns and let the frontend format them
+_FIB_TABLE_COLUMNS = {
+    'level_pct': st.column_config.NumberColumn('level_pct', format='%.1f%%'),
+    'price_formatted': st.column_config.NumberColumn('price_formatted', format='$%.2f')
+}
+_PIVOT_TABLE_COLUMNS = {'Price': st.column_config.NumberColumn('Price', format='$%.2f')}
+
+# Session-state keys of the expanders that read market sentiment
+_SENTIMENT_SECTION_KEYS = ('sentiment_expander', 'integration_expander', 'alerts_expander')
+
+# Predefined pattern scanner lists
+_SCANNER_STOCK_LISTS = {
+    "S&P 500 Top 10": ("AAPL", "MSFT", "AMZN", "NVDA", "GOOGL", "TSLA", "META", "GOOG", "BRK-B", "UNH"),
+    "FAANG Stocks": ("META", "AAPL", "AMZN", "NFLX", "GOOGL"),
+    "Tech Leaders": ("AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "CRM", "ORCL", "ADBE"),
+    "Crypto Leaders": ("BTC-USD", "ETH-USD", "BNB-USD", "XRP-USD", "ADA-USD"),
+    "Custom": ()
+}
+
+@lru_cache(maxsize=1)
+def footer_markdown():
+    """Page footer; the GitHub user comes from secrets once per process, without requiring a secrets file"""
+    try:
+        github_user = st.secrets.get('GITHUB_USER', 'm-zayed5722')
+    except:
+        github_user = 'm-zayed5722'
+    
+    return (
+        "*Built with Streamlit • Powered by Yahoo Finance • "
+        f"[View Source Code](https://github.com/{github_user}/elliott-wave-analyzer)*"
+    )
+
+def fib_level_table(levels):
+    """Fibonacci levels as a numeric (percent, price) table for st.dataframe"""
+    return pd.DataFrame({
+        'level_pct': np.fromiter((level['level'] for level in levels), dtype=np.float64, count=len(levels)) * 100,
+        'price_formatted': np.fromiter((level['price'] for level in levels), dtype=np.float64, count=len(levels))
+    })
+
 # Main app
 def main():
     # Header
@@ -2833,15 +3157,30 @@ def main():
     
     with col1:
         if analyze_button or st.session_state.price_data is not None:
-            with st.spinner(f"Fetching data for {ticker}..."):
-                df = fetch_stock_data(ticker, timeframe, range_period)
-                st.session_state.price_data = df
+            # Only refetch and reanalyze when the inputs change; other widget reruns reuse the stored results
+            analysis_key = (ticker, timeframe, range_period, zigzag_threshold)
+            if analyze_button or st.session_state.analysis_key != analysis_key:
+                # An open sentiment section will need it this run; download it while prices load and waves are analyzed
+                if any(st.session_state.get(key) for key in _SENTIMENT_SECTION_KEYS):
+                    prefetch = script_run_executor(1)
+                    prefetch.submit(calculate_market_sentiment, ticker, period_days=30)
+                    prefetch.shutdown(wait=False)
+                
+                with st.spinner(f"Fetching data for {ticker}..."):
+                    df = fetch_stock_data(ticker, timeframe, range_period)
+                    st.session_state.price_data = df
+                
+                analysis = None
+                if not df.empty:
+                    with st.spinner("Performing Elliott Wave analysis..."):
+                        analysis = analyze_elliott_waves(df, zigzag_threshold)
+                st.session_state.analysis_results = analysis
+                st.session_state.analysis_key = analysis_key
+            
+            df = st.session_state.price_data
+            analysis = st.session_state.analysis_results
             
             if not df.empty:
-                with st.spinner("Performing Elliott Wave analysis..."):
-                    analysis = analyze_elliott_waves(df, zigzag_threshold)
-                    st.session_state.analysis_results = analysis
-                
                 # Display chart
                 fig = create_candlestick_chart(df, analysis)
                 st.plotly_chart(fig, width="stretch")
@@ -2868,21 +3207,22 @@ def main():
                     st.markdown("### 🎯 Chart Analysis Summary")
                     st.markdown(chart_summary)
                     
-                    # Add debug info in an expander (temporary)
-                    with st.expander("🔍 Debug Info (Development)", expanded=False):
-                        st.write("**Analysis Results:**")
-                        primary_count = analysis.get('primary_count')
-                        if primary_count:
-                            st.json({
-                                'primary_confidence': getattr(primary_count, 'confidence_score', 'N/A'),
-                                'primary_pattern': getattr(primary_count, 'pattern_type', 'N/A'),
-                                'primary_labels': getattr(primary_count, 'labels', 'N/A')
-                            })
-                        else:
-                            st.write("No primary count found")
+                    # Development-only debug panel; set EW_DEBUG to show it
+                    if DEBUG_PANEL:
+                        with st.expander("🔍 Debug Info (Development)", expanded=False):
+                            st.write("**Analysis Results:**")
+                            primary_count = analysis.get('primary_count')
+                            if primary_count:
+                                st.json({
+                                    'primary_confidence': primary_count.get('confidence_score', 'N/A'),
+                                    'primary_pattern': primary_count.get('pattern_type', 'N/A'),
+                                    'primary_labels': primary_count.get('labels', 'N/A')
+                                })
+                            else:
+                                st.write("No primary count found")
                         
-                        st.write(f"**Pivot count:** {len(analysis.get('zigzag_pivots', []))}")
-                        st.write(f"**Invalidation levels:** {analysis.get('invalidation_levels', {})}")
+                            st.write(f"**Pivot count:** {len(analysis.get('zigzag_pivots', []))}")
+                            st.write(f"**Invalidation levels:** {analysis.get('invalidation_levels', {})}")
                     
                     st.markdown("---")
                 
@@ -2948,7 +3288,9 @@ def main():
             
             # Add Price Targets section
             st.markdown("---")
-            current_price = st.session_state.price_data['close'].iloc[-1] if st.session_state.price_data is not None and not st.session_state.price_data.empty else 0
+            # Latest close, shared by the targets, indicator confluence and alert sections below
+            price_data = st.session_state.price_data
+            current_price = price_data['close'].iat[-1] if price_data is not None and not price_data.empty else 0
             
             if current_price > 0:
                 price_targets = calculate_price_targets(analysis, current_price)
@@ -3002,141 +3344,147 @@ def main():
                 
                 # Confidence Analysis Section
                 st.markdown("---")
-                with st.expander("🎯 **Advanced Confidence Analysis**", expanded=False):
-                    pivots = analysis.get('zigzag_pivots', [])
-                    price_data = st.session_state.price_data
+                # Sections below only compute while open; opening or closing one triggers a rerun
+                confidence_section = st.expander("🎯 **Advanced Confidence Analysis**", expanded=False, key="confidence_expander", on_change="rerun")
+                with confidence_section:
+                    if confidence_section.open:
+                        pivots = analysis.get('zigzag_pivots', [])
                     
-                    if pivots and len(pivots) >= 3:
-                        with st.spinner("Calculating detailed confidence metrics..."):
-                            confidence_data = calculate_detailed_confidence_score(analysis, pivots, price_data)
+                        if pivots and len(pivots) >= 3:
+                            with st.spinner("Calculating detailed confidence metrics..."):
+                                confidence_data = calculate_detailed_confidence_score(analysis, pivots, price_data)
                         
-                        if confidence_data:
-                            display_confidence_analysis(confidence_data)
-                    else:
-                        st.info("💡 Advanced confidence analysis requires sufficient wave data (minimum 3 pivots)")
+                            if confidence_data:
+                                display_confidence_analysis(confidence_data)
+                        else:
+                            st.info("💡 Advanced confidence analysis requires sufficient wave data (minimum 3 pivots)")
                 
                 # Technical Indicators Section
                 st.markdown("---")
-                with st.expander("📊 **Technical Indicator Analysis**", expanded=False):
-                    price_data = st.session_state.price_data
-                    
-                    if price_data is not None and not price_data.empty and len(price_data) >= 50:
-                        with st.spinner("Calculating technical indicators..."):
-                            # Calculate all technical indicators
-                            indicators = calculate_technical_indicators(price_data)
+                indicators_section = st.expander("📊 **Technical Indicator Analysis**", expanded=False, key="indicators_expander", on_change="rerun")
+                with indicators_section:
+                    if indicators_section.open:
+                        if price_data is not None and not price_data.empty and len(price_data) >= 50:
+                            with st.spinner("Calculating technical indicators..."):
+                                # Calculate all technical indicators
+                                indicators = calculate_technical_indicators(price_data)
                             
-                            if indicators:
-                                # Analyze confluence with Elliott Wave
-                                current_price = price_data['close'].iloc[-1]
-                                confluence = analyze_indicator_confluence(indicators, current_price, analysis)
+                                if indicators:
+                                    # Analyze confluence with Elliott Wave
+                                    confluence = analyze_indicator_confluence(indicators, current_price, analysis)
                                 
-                                # Display technical analysis
-                                display_technical_indicators(indicators, confluence, current_price)
+                                    # Display technical analysis
+                                    display_technical_indicators(indicators, confluence, current_price)
                                 
-                                # Add summary insight
-                                if confluence and confluence.get('overall_score') is not None:
-                                    score = confluence['overall_score']
-                                    alignment = confluence['wave_alignment']
+                                    # Add summary insight
+                                    if confluence and confluence.get('overall_score') is not None:
+                                        score = confluence['overall_score']
+                                        alignment = confluence['wave_alignment']
                                     
-                                    st.markdown("#### 🎯 **Technical Summary**")
-                                    if alignment == 'bullish' and score > 30:
-                                        st.success(f"✅ **Strong Bullish Confluence** ({score:+.0f}%) - Technical indicators support Elliott Wave analysis")
-                                    elif alignment == 'bearish' and score < -30:
-                                        st.error(f"⚠️ **Strong Bearish Confluence** ({score:+.0f}%) - Technical indicators support Elliott Wave analysis")
-                                    else:
-                                        st.warning(f"⚡ **Mixed Signals** ({score:+.0f}%) - Technical indicators show conflicting signals with Elliott Wave")
-                            else:
-                                st.info("💡 Unable to calculate technical indicators with current data")
-                    else:
-                        st.info("💡 Technical indicators require at least 50 data points for accurate analysis")
+                                        st.markdown("#### 🎯 **Technical Summary**")
+                                        if alignment == 'bullish' and score > 30:
+                                            st.success(f"✅ **Strong Bullish Confluence** ({score:+.0f}%) - Technical indicators support Elliott Wave analysis")
+                                        elif alignment == 'bearish' and score < -30:
+                                            st.error(f"⚠️ **Strong Bearish Confluence** ({score:+.0f}%) - Technical indicators support Elliott Wave analysis")
+                                        else:
+                                            st.warning(f"⚡ **Mixed Signals** ({score:+.0f}%) - Technical indicators show conflicting signals with Elliott Wave")
+                                else:
+                                    st.info("💡 Unable to calculate technical indicators with current data")
+                        else:
+                            st.info("💡 Technical indicators require at least 50 data points for accurate analysis")
                 
                 # Elliott Wave Rule Validation Section
                 st.markdown("---")
-                with st.expander("⚖️ **Elliott Wave Rule Validation**", expanded=False):
-                    pivots = analysis.get('zigzag_pivots', [])
+                validation_section = st.expander("⚖️ **Elliott Wave Rule Validation**", expanded=False, key="validation_expander", on_change="rerun")
+                with validation_section:
+                    if validation_section.open:
+                        pivots = analysis.get('zigzag_pivots', [])
                     
-                    if pivots and len(pivots) >= 3:
-                        with st.spinner("Validating Elliott Wave rules and guidelines..."):
-                            # Get wave labels if available
-                            primary_count = analysis.get('primary_count', {})
-                            wave_labels = primary_count.get('labels', []) if hasattr(primary_count, 'get') else None
+                        if pivots and len(pivots) >= 3:
+                            with st.spinner("Validating Elliott Wave rules and guidelines..."):
+                                # Get wave labels if available
+                                primary_count = analysis.get('primary_count', {})
+                                wave_labels = primary_count.get('labels', [])
                             
-                            # Validate Elliott Wave rules
-                            validation_results = validate_elliott_wave_rules(pivots, wave_labels)
+                                # Validate Elliott Wave rules
+                                validation_results = validate_elliott_wave_rules(pivots, wave_labels)
                         
-                        if validation_results:
-                            display_wave_validation(validation_results)
+                            if validation_results:
+                                display_wave_validation(validation_results)
                             
-                            # Add actionable insights based on validation
-                            validity_score = validation_results.get('validity_score', 0)
-                            is_valid = validation_results.get('overall_validity', False)
+                                # Add actionable insights based on validation
+                                validity_score = validation_results.get('validity_score', 0)
+                                is_valid = validation_results.get('overall_validity', False)
                             
-                            st.markdown("#### 🎯 **Validation Summary & Trading Implications**")
+                                st.markdown("#### 🎯 **Validation Summary & Trading Implications**")
                             
-                            if is_valid and validity_score >= 80:
-                                st.success(f"✅ **Excellent Wave Count** ({validity_score}%) - This Elliott Wave pattern meets all major rules and guidelines. High confidence for trading decisions.")
-                            elif is_valid and validity_score >= 60:
-                                st.warning(f"✅ **Valid Wave Count** ({validity_score}%) - Pattern is valid but consider additional confirmation before major positions.")
-                            else:
-                                st.error(f"❌ **Invalid Wave Count** ({validity_score}%) - Critical rule violations detected. Avoid trading this pattern or seek alternative wave counts.")
+                                if is_valid and validity_score >= 80:
+                                    st.success(f"✅ **Excellent Wave Count** ({validity_score}%) - This Elliott Wave pattern meets all major rules and guidelines. High confidence for trading decisions.")
+                                elif is_valid and validity_score >= 60:
+                                    st.warning(f"✅ **Valid Wave Count** ({validity_score}%) - Pattern is valid but consider additional confirmation before major positions.")
+                                else:
+                                    st.error(f"❌ **Invalid Wave Count** ({validity_score}%) - Critical rule violations detected. Avoid trading this pattern or seek alternative wave counts.")
                             
-                            # Trading recommendations based on validation
-                            violations = validation_results.get('rule_violations', [])
-                            if violations:
-                                st.markdown("**🚨 Trading Recommendations:**")
-                                st.markdown("- ❌ **Do not trade** this wave count due to rule violations")
-                                st.markdown("- 🔍 **Reassess** wave labeling or look for alternative counts")
-                                st.markdown("- ⏳ **Wait** for pattern completion or confirmation")
-                                st.markdown("- 📚 **Study** Elliott Wave theory for proper pattern recognition")
-                            else:
-                                confirmations = validation_results.get('rule_confirmations', [])
-                                guidelines_met = len([g for g in validation_results.get('guidelines_check', []) if '✅' in g.get('description', '')])
-                                
-                                st.markdown("**✅ Trading Recommendations:**")
-                                if len(confirmations) >= 3 and guidelines_met >= 2:
-                                    st.markdown("- 🎯 **High-confidence setup** - All major rules confirmed")
-                                    st.markdown("- 💰 **Consider standard position sizing** with proper risk management")
-                                    st.markdown("- 📈 **Monitor for entry signals** at Fibonacci levels")
-                                elif len(confirmations) >= 2:
-                                    st.markdown("- ✅ **Good setup** - Major rules confirmed")
-                                    st.markdown("- ⚖️ **Use conservative position sizing**")
-                                    st.markdown("- 🔍 **Seek additional confirmation** before entry")
+                                # Trading recommendations based on validation
+                                violations = validation_results.get('rule_violations', [])
+                                if violations:
+                                    st.markdown("**🚨 Trading Recommendations:**")
+                                    st.markdown("- ❌ **Do not trade** this wave count due to rule violations")
+                                    st.markdown("- 🔍 **Reassess** wave labeling or look for alternative counts")
+                                    st.markdown("- ⏳ **Wait** for pattern completion or confirmation")
+                                    st.markdown("- 📚 **Study** Elliott Wave theory for proper pattern recognition")
                                 else:
-                                    st.markdown("- ⚠️ **Proceed with caution** - Limited rule confirmation")
-                                    st.markdown("- 📊 **Consider paper trading** first")
-                                    st.markdown("- 🔍 **Wait for clearer signals**")
-                    else:
-                        st.info("💡 Elliott Wave rule validation requires at least 3 pivot points (minimum wave structure)")
+                                    confirmations = validation_results.get('rule_confirmations', [])
+                                    guidelines_met = sum(g['is_positive'] for g in validation_results.get('guidelines_check', []))
+                                
+                                    st.markdown("**✅ Trading Recommendations:**")
+                                    if len(confirmations) >= 3 and guidelines_met >= 2:
+                                        st.markdown("- 🎯 **High-confidence setup** - All major rules confirmed")
+                                        st.markdown("- 💰 **Consider standard position sizing** with proper risk management")
+                                        st.markdown("- 📈 **Monitor for entry signals** at Fibonacci levels")
+                                    elif len(confirmations) >= 2:
+                                        st.markdown("- ✅ **Good setup** - Major rules confirmed")
+                                        st.markdown("- ⚖️ **Use conservative position sizing**")
+                                        st.markdown("- 🔍 **Seek additional confirmation** before entry")
+                                    else:
+                                        st.markdown("- ⚠️ **Proceed with caution** - Limited rule confirmation")
+                                        st.markdown("- 📊 **Consider paper trading** first")
+                                        st.markdown("- 🔍 **Wait for clearer signals**")
+                        else:
+                            st.info("💡 Elliott Wave rule validation requires at least 3 pivot points (minimum wave structure)")
                 
                 # Market Sentiment Dashboard Section
                 st.markdown("---")
-                with st.expander("🧠 **Market Sentiment Dashboard**", expanded=False):
-                    with st.spinner(f"Analyzing market sentiment for {ticker}..."):
-                        sentiment_data = calculate_market_sentiment(ticker, period_days=30)
+                sentiment_section = st.expander("🧠 **Market Sentiment Dashboard**", expanded=False, key="sentiment_expander", on_change="rerun")
+                with sentiment_section:
+                    if sentiment_section.open:
+                        with st.spinner(f"Analyzing market sentiment for {ticker}..."):
+                            sentiment_data = calculate_market_sentiment(ticker, period_days=30)
                         display_market_sentiment(sentiment_data, ticker)
                 
                 # Sentiment-Wave Integration Section
                 st.markdown("---") 
-                with st.expander("🔗 **Sentiment-Wave Integration**", expanded=False):
-                    with st.spinner("Integrating sentiment with Elliott Wave analysis..."):
-                        sentiment_data = calculate_market_sentiment(ticker, period_days=30)
-                        integration = integrate_sentiment_with_waves(analysis, sentiment_data, ticker)
-                        if integration:
-                            display_sentiment_wave_integration(integration, ticker)
-                        else:
-                            st.info("💡 Integration analysis requires both wave and sentiment data")
+                integration_section = st.expander("🔗 **Sentiment-Wave Integration**", expanded=False, key="integration_expander", on_change="rerun")
+                with integration_section:
+                    if integration_section.open:
+                        with st.spinner("Integrating sentiment with Elliott Wave analysis..."):
+                            sentiment_data = calculate_market_sentiment(ticker, period_days=30)
+                            integration = integrate_sentiment_with_waves(analysis, sentiment_data, ticker)
+                            if integration:
+                                display_sentiment_wave_integration(integration, ticker)
+                            else:
+                                st.info("💡 Integration analysis requires both wave and sentiment data")
                 
                 # Alert System Section
                 st.markdown("---")
-                with st.expander("🚨 **Real-Time Alert System**", expanded=False):
-                    # Get current price for alert calculations
-                    current_price = df['Close'].iloc[-1] if not df.empty else 0
-                    
-                    # Get sentiment data for alert system
-                    sentiment_data = calculate_market_sentiment(ticker, period_days=30)
+                alerts_section = st.expander("🚨 **Real-Time Alert System**", expanded=False, key="alerts_expander", on_change="rerun")
+                with alerts_section:
+                    if alerts_section.open:
+                        with st.spinner(f"Analyzing market sentiment for {ticker}..."):
+                            sentiment_data = calculate_market_sentiment(ticker, period_days=30)
                     
-                    # Display comprehensive alert system
-                    display_alert_system(analysis, sentiment_data, current_price, ticker)
+                        # Display comprehensive alert system
+                        display_alert_system(analysis, sentiment_data, current_price, ticker)
             
             
             
@@ -3163,9 +3511,9 @@ def main():
                             with tf_tabs[i]:
                                 tf_analysis = tf_data.get('analysis')
                                 if tf_analysis and tf_analysis.get('primary_count'):
-                                    primary = tf_analysis.get('primary_count', {})
-                                    score = getattr(primary, 'confidence_score', 0) if hasattr(primary, 'confidence_score') else primary.get('confidence_score', 0)
-                                    pattern = getattr(primary, 'pattern_type', 'Unknown') if hasattr(primary, 'pattern_type') else primary.get('pattern_type', 'Unknown')
+                                    primary = tf_analysis['primary_count']
+                                    score = primary.get('confidence_score', 0)
+                                    pattern = primary.get('pattern_type', 'Unknown')
                                     
                                     col_a, col_b = st.columns(2)
                                     
@@ -3190,9 +3538,7 @@ def main():
                     for tf, tf_data in multi_tf_analysis.items():
                         tf_analysis = tf_data.get('analysis')
                         if tf_analysis and tf_analysis.get('primary_count'):
-                            primary = tf_analysis.get('primary_count', {})
-                            score = getattr(primary, 'confidence_score', 0) if hasattr(primary, 'confidence_score') else primary.get('confidence_score', 0)
-                            confluence_scores.append(score)
+                            confluence_scores.append(tf_analysis['primary_count'].get('confidence_score', 0))
                     
                     if confluence_scores:
                         avg_confidence = sum(confluence_scores) / len(confluence_scores)
@@ -3275,13 +3621,11 @@ def main():
                 st.write("**🔽 Retracement Levels**")
                 retracements = fib_levels.get('retracements', [])
                 if retracements:
-                    ret_df = pd.DataFrame(retracements)
-                    ret_df['level_pct'] = ret_df['level'].apply(lambda x: f"{x:.1%}")
-                    ret_df['price_formatted'] = ret_df['price'].apply(lambda x: f"${x:.2f}")
                     st.dataframe(
-                        ret_df[['level_pct', 'price_formatted']], 
+                        fib_level_table(retracements),
                         width="stretch",
-                        hide_index=True
+                        hide_index=True,
+                        column_config=_FIB_TABLE_COLUMNS
                     )
                 else:
                     st.info("No retracement levels calculated")
@@ -3290,13 +3634,11 @@ def main():
                 st.write("**🔼 Extension Levels**")  
                 extensions = fib_levels.get('extensions', [])
                 if extensions:
-                    ext_df = pd.DataFrame(extensions)
-                    ext_df['level_pct'] = ext_df['level'].apply(lambda x: f"{x:.1%}")
-                    ext_df['price_formatted'] = ext_df['price'].apply(lambda x: f"${x:.2f}")
                     st.dataframe(
-                        ext_df[['level_pct', 'price_formatted']], 
+                        fib_level_table(extensions),
                         width="stretch",
-                        hide_index=True
+                        hide_index=True,
+                        column_config=_FIB_TABLE_COLUMNS
                     )
                 else:
                     st.info("No extension levels calculated")
@@ -3305,11 +3647,9 @@ def main():
             st.write("**🔗 Pivot Points Data**")
             pivots = analysis.get('zigzag_pivots', [])
             if pivots:
-                pivot_df = pd.DataFrame(pivots)
-                pivot_df['price_formatted'] = pivot_df['price'].apply(lambda x: f"${x:.2f}")
-                pivot_df = pivot_df[['timestamp', 'price_formatted', 'type']]
+                pivot_df = pd.DataFrame(pivots)[['timestamp', 'price', 'type']]
                 pivot_df.columns = ['Date/Time', 'Price', 'Type']
-                st.dataframe(pivot_df, width="stretch", hide_index=True)
+                st.dataframe(pivot_df, width="stretch", hide_index=True, column_config=_PIVOT_TABLE_COLUMNS)
             
             st.write("**⚙️ Analysis Parameters**")
             st.json({
@@ -3340,9 +3680,16 @@ def main():
                     }
                 }
                 
+                # orjson writes NumPy values natively and is much faster on large analyses
+                if orjson is not None:
+                    report = orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY |
+                                          orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC)
+                else:
+                    report = json.dumps(export_data, indent=2)
+                
                 st.download_button(
                     label="📥 Download Complete JSON Report",
-                    data=json.dumps(export_data, indent=2),
+                    data=report,
                     file_name=f"elliott_wave_analysis_{ticker}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json",
                     help="Download complete analysis data including chart descriptions"
@@ -3357,19 +3704,10 @@ def main():
     with st.expander("📊 Scan Multiple Stocks for Elliott Wave Setups", expanded=False):
         st.markdown("**Search for Elliott Wave patterns across multiple stocks simultaneously**")
         
-        # Predefined stock lists
-        stock_lists = {
-            "S&P 500 Top 10": ["AAPL", "MSFT", "AMZN", "NVDA", "GOOGL", "TSLA", "META", "GOOG", "BRK-B", "UNH"],
-            "FAANG Stocks": ["META", "AAPL", "AMZN", "NFLX", "GOOGL"],
-            "Tech Leaders": ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "CRM", "ORCL", "ADBE"],
-            "Crypto Leaders": ["BTC-USD", "ETH-USD", "BNB-USD", "XRP-USD", "ADA-USD"],
-            "Custom": []
-        }
-        
         col_scan1, col_scan2 = st.columns(2)
         
         with col_scan1:
-            selected_list = st.selectbox("Select Stock List", list(stock_lists.keys()))
+            selected_list = st.selectbox("Select Stock List", tuple(_SCANNER_STOCK_LISTS))
             
             if selected_list == "Custom":
                 custom_symbols = st.text_area(
@@ -3379,7 +3717,7 @@ def main():
                 )
                 symbols_to_scan = [s.strip().upper() for s in custom_symbols.split(",") if s.strip()]
             else:
-                symbols_to_scan = stock_lists[selected_list]
+                symbols_to_scan = _SCANNER_STOCK_LISTS[selected_list]
                 st.info(f"Will scan: {', '.join(symbols_to_scan)}")
         
         with col_scan2:
@@ -3460,17 +3798,52 @@ def main():
     with st.expander("🚀 Professional Platform Overview", expanded=False):
         display_platform_overview()
     
-    # Get GitHub info safely without secrets dependency
-    try:
-        github_user = st.secrets.get('GITHUB_USER', 'm-zayed5722')
-    except:
-        github_user = 'm-zayed5722'
-    
-    st.markdown(
-        "*Built with Streamlit • Powered by Yahoo Finance • "
-        f"[View Source Code](https://github.com/{github_user}/elliott-wave-analyzer)*"
+    st.markdown(footer_markdown())
+
+@st.cache_data(ttl=900, max_entries=64, show_spinner=False)
+def fetch_daily_history(symbol, period):
+    """Raw Yahoo daily history for the sentiment inputs; VIX and the indices are shared by every symbol"""
+    return fetch_history(symbol, period)
+
+# Major indices used for market breadth: S&P 500, Dow, NASDAQ
+_BREADTH_INDICES = ('^GSPC', '^DJI', '^IXIC')
+
+# Overall sentiment weights for the VIX, fear & greed and market breadth scores
+_SENTIMENT_WEIGHTS = np.array([0.3, 0.5, 0.2])
+
+# Sentiment buckets are looked up with searchsorted(side='right'): bucket i holds edges[i-1] <= value < edges[i].
+# VIX readings of exactly 20 and 30 are still Neutral and Fear, and a score of exactly 25 still gets the
+# extreme fear advice, so those edges are nudged up by one ulp.
+_SENTIMENT_SCORE_EDGES = np.array([20, 40, 60, 80])
+_SENTIMENT_LABELS = ('Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed')
+_VIX_EDGES = np.array([12, 16, np.nextafter(20, np.inf), np.nextafter(30, np.inf)])
+_VIX_BUCKETS = (('Extreme Greed', 90), ('Greed', 75), ('Neutral', 50), ('Fear', 25), ('Extreme Fear', 10))
+_RECOMMENDATION_EDGES = np.array([np.nextafter(25, np.inf), 55, 75])
+_SENTIMENT_RECOMMENDATIONS = (
+    (
+        "🟢 Extreme fear detected - potential buying opportunity",
+        "💡 Contrarian investors may find value here",
+        "⏳ Wait for confirmation signals before entering"
+    ),
+    (
+        "🔵 Fear present - market may find support soon",
+        "🎯 Look for oversold bounce opportunities",
+        "📉 Defensive positioning may be appropriate"
+    ),
+    (
+        "🟡 Moderate optimism - normal market conditions",
+        "✅ Good environment for trend-following strategies",
+        "📊 Monitor key support/resistance levels"
+    ),
+    (
+        "🔴 Extreme greed detected - consider taking profits",
+        "⚠️ Market may be overextended - watch for reversal signals",
+        "📈 If trend is strong, consider trailing stops"
     )
+)
 
+# Market data moves intraday, so sentiment is reused for 15 minutes; the page asks for it up to three times per run
+@st.cache_data(ttl=900, max_entries=64, show_spinner=False)
 def calculate_market_sentiment(symbol, period_days=30):
     """
     Calculate comprehensive market sentiment indicators
@@ -3487,38 +3860,35 @@ def calculate_market_sentiment(symbol, period_days=30):
             'recommendations': []
         }
         
+        # Start all five downloads together; each section below waits only for its own
+        with script_run_executor(len(_BREADTH_INDICES) + 2) as executor:
+            vix_download = executor.submit(fetch_daily_history, "^VIX", f"{period_days}d")
+            stock_download = executor.submit(fetch_daily_history, symbol, f"{period_days}d")
+            index_downloads = {
+                index_symbol: executor.submit(fetch_daily_history, index_symbol, "5d")
+                for index_symbol in _BREADTH_INDICES
+            }
+        
         # Get VIX data for fear/greed analysis
         try:
-            vix_ticker = yf.Ticker("^VIX")
-            vix_data = vix_ticker.history(period=f"{period_days}d")
+            vix_data = vix_download.result()
             
             if not vix_data.empty:
-                current_vix = vix_data['Close'].iloc[-1]
-                vix_avg = vix_data['Close'].mean()
-                vix_std = vix_data['Close'].std()
+                vix_closes = vix_data['Close'].to_numpy(dtype=np.float64)
+                current_vix = vix_closes[-1]
+                vix_closes = vix_closes[~np.isnan(vix_closes)]
+                vix_avg = vix_closes.mean() if vix_closes.size else np.nan
+                vix_closes.sort()
                 
-                # VIX analysis
-                if current_vix > 30:
-                    vix_sentiment = "Extreme Fear"
-                    vix_score = 10
-                elif current_vix > 20:
-                    vix_sentiment = "Fear"
-                    vix_score = 25
-                elif current_vix < 12:
-                    vix_sentiment = "Extreme Greed"
-                    vix_score = 90
-                elif current_vix < 16:
-                    vix_sentiment = "Greed"
-                    vix_score = 75
-                else:
-                    vix_sentiment = "Neutral"
-                    vix_score = 50
+                # VIX analysis (a missing close counts as Neutral)
+                vix_bucket = 2 if np.isnan(current_vix) else int(np.searchsorted(_VIX_EDGES, current_vix, side='right'))
+                vix_sentiment, vix_score = _VIX_BUCKETS[vix_bucket]
                 
                 sentiment_data['vix_analysis'] = {
                     'current_vix': current_vix,
                     'average_vix': vix_avg,
-                    'vix_percentile': ((current_vix - vix_data['Close'].min()) / 
-                                     (vix_data['Close'].max() - vix_data['Close'].min())) * 100,
+                    # Share of the period's closes at or below today's, in percent
+                    'vix_percentile': np.searchsorted(vix_closes, current_vix, side='right') / max(vix_closes.size, 1) * 100,
                     'sentiment': vix_sentiment,
                     'score': vix_score,
                     'interpretation': f"VIX at {current_vix:.2f} indicates {vix_sentiment.lower()}"
@@ -3531,42 +3901,57 @@ def calculate_market_sentiment(symbol, period_days=30):
                 'interpretation': 'VIX data unavailable'
             }
         
-        # Get stock data for additional sentiment analysis
+        # Get stock data for additional sentiment analysis; fg_scores holds the component scores
+        # (momentum, strength, volatility, volume) alongside their display entries
+        fg_scores = np.empty(0)
         try:
-            stock = yf.Ticker(symbol)
-            stock_data = stock.history(period=f"{period_days}d")
+            stock_data = stock_download.result()
             
             if not stock_data.empty:
-                # Price momentum analysis
-                returns = stock_data['Close'].pct_change().dropna()
-                positive_days = (returns > 0).sum()
+                close = stock_data['Close'].to_numpy(dtype=np.float64)
+                volume = stock_data['Volume'].to_numpy(dtype=np.float64)
+                
+                # Price momentum analysis (daily returns, gaps dropped)
+                returns = close[1:] / close[:-1] - 1.0
+                returns = returns[~np.isnan(returns)]
                 total_days = len(returns)
-                positive_ratio = positive_days / total_days if total_days > 0 else 0.5
+                positive_ratio = np.count_nonzero(returns > 0) / total_days if total_days > 0 else 0.5
                 
                 # Volatility analysis
-                volatility = returns.std() * (252 ** 0.5)  # Annualized volatility
+                volatility = returns.std(ddof=1) * (252 ** 0.5) if total_days > 1 else np.nan  # Annualized volatility
                 
                 # Volume analysis
-                avg_volume = stock_data['Volume'].mean()
-                recent_volume = stock_data['Volume'].tail(5).mean()
+                avg_volume = np.nanmean(volume)
+                recent_volume = np.nanmean(volume[-5:])
                 volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
                 
                 # RSI-based sentiment
                 def calculate_rsi(prices, period=14):
-                    delta = prices.diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-                    rs = gain / loss
-                    rsi = 100 - (100 / (1 + rs))
-                    return rsi.iloc[-1] if not rsi.empty else 50
+                    """Latest simple-mean RSI, computed from the final window only"""
+                    prices = prices.to_numpy(dtype=np.float64)
+                    if len(prices) == 0:
+                        return 50
+                    if len(prices) < period:
+                        return np.nan
+                    # The first bar has no change and counts as a zero move inside the window
+                    delta = np.diff(prices[-(period + 1):])
+                    gain = delta[delta > 0].sum() / period
+                    loss = -delta[delta < 0].sum() / period
+                    if loss == 0:
+                        return 100.0 if gain > 0 else np.nan
+                    return 100 - (100 / (1 + gain / loss))
                 
                 rsi = calculate_rsi(stock_data['Close'])
+                momentum_score = positive_ratio * 100
+                volatility_score = max(0, min(100, 100 - volatility * 200))  # Lower volatility = higher score
+                volume_score = min(100, volume_ratio * 50)
+                fg_scores = np.array([momentum_score, rsi, volatility_score, volume_score], dtype=np.float64)
                 
                 # Fear & Greed components
                 sentiment_data['fear_greed_components'] = {
                     'price_momentum': {
                         'value': positive_ratio * 100,
-                        'score': positive_ratio * 100,
+                        'score': momentum_score,
                         'interpretation': f"{positive_ratio*100:.1f}% positive days in last {period_days} days"
                     },
                     'price_strength': {
@@ -3576,16 +3961,17 @@ def calculate_market_sentiment(symbol, period_days=30):
                     },
                     'volatility': {
                         'value': volatility * 100,
-                        'score': max(0, min(100, 100 - volatility * 200)),  # Lower volatility = higher score
+                        'score': volatility_score,
                         'interpretation': f"Annualized volatility: {volatility*100:.1f}%"
                     },
                     'volume': {
                         'value': volume_ratio,
-                        'score': min(100, volume_ratio * 50),
+                        'score': volume_score,
                         'interpretation': f"Recent volume {volume_ratio:.1f}x average"
                     }
                 }
         except:
+            fg_scores = np.full(4, 50.0)
             sentiment_data['fear_greed_components'] = {
                 'price_momentum': {'value': 50, 'score': 50, 'interpretation': 'Data unavailable'},
                 'price_strength': {'value': 50, 'score': 50, 'interpretation': 'Data unavailable'},
@@ -3597,12 +3983,12 @@ def calculate_market_sentiment(symbol, period_days=30):
         try:
             # Get major indices for breadth analysis
             indices_data = {}
-            for index_symbol in ['^GSPC', '^DJI', '^IXIC']:  # S&P 500, Dow, NASDAQ
+            for index_symbol, download in index_downloads.items():
                 try:
-                    index_ticker = yf.Ticker(index_symbol)
-                    index_hist = index_ticker.history(period="5d")
+                    index_hist = download.result()
                     if not index_hist.empty:
-                        daily_change = ((index_hist['Close'].iloc[-1] / index_hist['Close'].iloc[0]) - 1) * 100
+                        index_close = index_hist['Close'].to_numpy()
+                        daily_change = ((index_close[-1] / index_close[0]) - 1) * 100
                         indices_data[index_symbol] = daily_change
                 except:
                     continue
@@ -3623,68 +4009,28 @@ def calculate_market_sentiment(symbol, period_days=30):
                 'interpretation': 'Market breadth data unavailable'
             }
         
-        # Calculate overall sentiment score
-        component_scores = []
-        
-        # VIX weight: 30%
-        if sentiment_data['vix_analysis'].get('score'):
-            component_scores.append(sentiment_data['vix_analysis']['score'] * 0.3)
-        
-        # Fear & Greed components weight: 50%
-        fg_scores = []
-        for component in sentiment_data['fear_greed_components'].values():
-            fg_scores.append(component['score'])
-        if fg_scores:
-            avg_fg_score = sum(fg_scores) / len(fg_scores)
-            component_scores.append(avg_fg_score * 0.5)
-        
-        # Market breadth weight: 20%
-        if sentiment_data['market_breadth'].get('breadth_score'):
-            component_scores.append(sentiment_data['market_breadth']['breadth_score'] * 0.2)
-        
-        if component_scores:
-            sentiment_data['sentiment_score'] = sum(component_scores)
+        # Calculate overall sentiment score: weighted mean of the VIX, fear & greed and breadth
+        # scores, re-normalized over the components that produced a value
+        fg_scores = fg_scores[~np.isnan(fg_scores)]
+        component_scores = np.array([
+            sentiment_data['vix_analysis'].get('score', np.nan),
+            fg_scores.mean() if fg_scores.size else np.nan,
+            sentiment_data['market_breadth'].get('breadth_score', np.nan)
+        ], dtype=np.float64)
+        present = ~np.isnan(component_scores)
+        
+        if present.any():
+            sentiment_data['sentiment_score'] = float(np.average(component_scores[present],
+                                                                 weights=_SENTIMENT_WEIGHTS[present]))
         else:
             sentiment_data['sentiment_score'] = 50
         
-        # Determine overall sentiment
+        # Determine overall sentiment and the matching recommendations
         score = sentiment_data['sentiment_score']
-        if score >= 80:
-            sentiment_data['overall_sentiment'] = "Extreme Greed"
-        elif score >= 60:
-            sentiment_data['overall_sentiment'] = "Greed"
-        elif score >= 40:
-            sentiment_data['overall_sentiment'] = "Neutral"
-        elif score >= 20:
-            sentiment_data['overall_sentiment'] = "Fear"
-        else:
-            sentiment_data['overall_sentiment'] = "Extreme Fear"
-        
-        # Generate recommendations
-        if score >= 75:
-            sentiment_data['recommendations'] = [
-                "🔴 Extreme greed detected - consider taking profits",
-                "⚠️ Market may be overextended - watch for reversal signals",
-                "📈 If trend is strong, consider trailing stops"
-            ]
-        elif score >= 55:
-            sentiment_data['recommendations'] = [
-                "🟡 Moderate optimism - normal market conditions",
-                "✅ Good environment for trend-following strategies",
-                "📊 Monitor key support/resistance levels"
-            ]
-        elif score <= 25:
-            sentiment_data['recommendations'] = [
-                "🟢 Extreme fear detected - potential buying opportunity",
-                "💡 Contrarian investors may find value here",
-                "⏳ Wait for confirmation signals before entering"
-            ]
-        else:
-            sentiment_data['recommendations'] = [
-                "🔵 Fear present - market may find support soon",
-                "🎯 Look for oversold bounce opportunities",
-                "📉 Defensive positioning may be appropriate"
-            ]
+        sentiment_data['overall_sentiment'] = _SENTIMENT_LABELS[int(np.searchsorted(_SENTIMENT_SCORE_EDGES, score, side='right'))]
+        sentiment_data['recommendations'] = list(
+            _SENTIMENT_RECOMMENDATIONS[int(np.searchsorted(_RECOMMENDATION_EDGES, score, side='right'))]
+        )
         
         return sentiment_data
         
@@ -3699,6 +4045,36 @@ def calculate_market_sentiment(symbol, period_days=30):
             'recommendations': ['Error calculating sentiment data']
         }
 
+# Gauge color and emoji per _SENTIMENT_SCORE_EDGES bucket
+_SENTIMENT_GAUGE_STYLES = (('green', '❄️'), ('purple', '📉'), ('blue', '😐'), ('orange', '📈'), ('red', '🔥'))
+
+_SENTIMENT_COMPONENT_CARD_TMPL = """
+<div style="padding: 15px; background: #1e1e1e; border-radius: 10px; border-left: 4px solid {color};">
+    <h5 style="color: {color}; margin: 0;">{title}</h5>
+    <h3 style="color: white; margin: 10px 0;">{score:.1f}/100</h3>
+    <p style="color: #888; margin: 0; font-size: 0.9em;">{interpretation}</p>
+</div>
+"""
+
+# Fear & greed cards in grid (row-major) order: momentum and RSI strength on top, volatility and volume below
+_SENTIMENT_COMPONENTS = (
+    ('price_momentum', '📈 Price Momentum', '#00ff41'),
+    ('price_strength', '💪 Price Strength (RSI)', '#4ecdc4'),
+    ('volatility', '⚡ Volatility', '#ff6b6b'),
+    ('volume', '📊 Volume Activity', '#ffd93d'),
+)
+
+_SENTIMENT_GAUGE_CARD_TMPL = """
+<div>
+    <h4>{heading}</h4>
+    <div style="padding: 20px; background: #1e1e1e; border-radius: 10px; border: 2px solid {color};">
+        <h3 style="color: {color}; margin: 0;">{headline}</h3>
+        <p style="color: white; margin: 10px 0;">{status}</p>
+        <p style="color: #888; margin: 0; font-size: 0.9em;">{interpretation}</p>
+    </div>
+</div>
+"""
+
 def display_market_sentiment(sentiment_data, symbol):
     """Display comprehensive market sentiment dashboard"""
     
@@ -3716,21 +4092,7 @@ def display_market_sentiment(sentiment_data, symbol):
         sentiment = sentiment_data['overall_sentiment']
         
         # Create sentiment gauge
-        if score >= 80:
-            gauge_color = "red"
-            gauge_emoji = "🔥"
-        elif score >= 60:
-            gauge_color = "orange" 
-            gauge_emoji = "📈"
-        elif score >= 40:
-            gauge_color = "blue"
-            gauge_emoji = "😐"
-        elif score >= 20:
-            gauge_color = "purple"
-            gauge_emoji = "📉"
-        else:
-            gauge_color = "green"
-            gauge_emoji = "❄️"
+        gauge_color, gauge_emoji = _SENTIMENT_GAUGE_STYLES[int(np.searchsorted(_SENTIMENT_SCORE_EDGES, score, side='right'))]
         
         st.markdown(f"""
         <div style="text-align: center; padding: 20px; background: linear-gradient(45deg, #1f1f1f, #2f2f2f); 
@@ -3748,85 +4110,47 @@ def display_market_sentiment(sentiment_data, symbol):
         st.markdown("#### 📊 **Fear & Greed Components**")
         
         components = sentiment_data['fear_greed_components']
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if 'price_momentum' in components:
-                momentum = components['price_momentum']
-                st.markdown(f"""
-                <div style="padding: 15px; background: #1e1e1e; border-radius: 10px; border-left: 4px solid #00ff41;">
-                    <h5 style="color: #00ff41; margin: 0;">📈 Price Momentum</h5>
-                    <h3 style="color: white; margin: 10px 0;">{momentum['score']:.1f}/100</h3>
-                    <p style="color: #888; margin: 0; font-size: 0.9em;">{momentum['interpretation']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            if 'volatility' in components:
-                volatility = components['volatility']
-                st.markdown(f"""
-                <div style="padding: 15px; background: #1e1e1e; border-radius: 10px; border-left: 4px solid #ff6b6b; margin-top: 10px;">
-                    <h5 style="color: #ff6b6b; margin: 0;">⚡ Volatility</h5>
-                    <h3 style="color: white; margin: 10px 0;">{volatility['score']:.1f}/100</h3>
-                    <p style="color: #888; margin: 0; font-size: 0.9em;">{volatility['interpretation']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        with col2:
-            if 'price_strength' in components:
-                strength = components['price_strength']
-                st.markdown(f"""
-                <div style="padding: 15px; background: #1e1e1e; border-radius: 10px; border-left: 4px solid #4ecdc4;">
-                    <h5 style="color: #4ecdc4; margin: 0;">💪 Price Strength (RSI)</h5>
-                    <h3 style="color: white; margin: 10px 0;">{strength['score']:.1f}/100</h3>
-                    <p style="color: #888; margin: 0; font-size: 0.9em;">{strength['interpretation']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            if 'volume' in components:
-                volume = components['volume']
-                st.markdown(f"""
-                <div style="padding: 15px; background: #1e1e1e; border-radius: 10px; border-left: 4px solid #ffd93d; margin-top: 10px;">
-                    <h5 style="color: #ffd93d; margin: 0;">📊 Volume Activity</h5>
-                    <h3 style="color: white; margin: 10px 0;">{volume['score']:.1f}/100</h3>
-                    <p style="color: #888; margin: 0; font-size: 0.9em;">{volume['interpretation']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        render_html_grid([
+            _SENTIMENT_COMPONENT_CARD_TMPL.format(
+                title=title,
+                color=color,
+                score=components[key]['score'],
+                interpretation=components[key]['interpretation']
+            )
+            for key, title, color in _SENTIMENT_COMPONENTS if key in components
+        ], columns=2)
     
     st.markdown("---")
     
     # VIX Analysis & Market Breadth
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if sentiment_data.get('vix_analysis'):
-            vix = sentiment_data['vix_analysis']
-            st.markdown("#### 😨 **VIX Fear Index**")
-            
-            vix_color = "green" if vix.get('current_vix', 20) > 25 else "red" if vix.get('current_vix', 20) < 15 else "orange"
-            
-            st.markdown(f"""
-            <div style="padding: 20px; background: #1e1e1e; border-radius: 10px; border: 2px solid {vix_color};">
-                <h3 style="color: {vix_color}; margin: 0;">Current VIX: {vix.get('current_vix', 'N/A'):.2f if vix.get('current_vix') else 'N/A'}</h3>
-                <p style="color: white; margin: 10px 0;">Status: {vix.get('sentiment', 'Unknown')}</p>
-                <p style="color: #888; margin: 0; font-size: 0.9em;">{vix.get('interpretation', 'No data')}</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col2:
-        if sentiment_data.get('market_breadth'):
-            breadth = sentiment_data['market_breadth']
-            st.markdown("#### 📊 **Market Breadth**")
-            
-            breadth_color = "green" if breadth.get('breadth_score', 50) > 60 else "red" if breadth.get('breadth_score', 50) < 40 else "orange"
-            
-            st.markdown(f"""
-            <div style="padding: 20px; background: #1e1e1e; border-radius: 10px; border: 2px solid {breadth_color};">
-                <h3 style="color: {breadth_color}; margin: 0;">Breadth Score: {breadth.get('breadth_score', 50):.1f}</h3>
-                <p style="color: white; margin: 10px 0;">Market Health</p>
-                <p style="color: #888; margin: 0; font-size: 0.9em;">{breadth.get('interpretation', 'No data')}</p>
-            </div>
-            """, unsafe_allow_html=True)
+    gauge_cards = []
+    if sentiment_data.get('vix_analysis'):
+        vix = sentiment_data['vix_analysis']
+        current_vix = vix.get('current_vix')
+        vix_color = "green" if vix.get('current_vix', 20) > 25 else "red" if vix.get('current_vix', 20) < 15 else "orange"
+        
+        gauge_cards.append(_SENTIMENT_GAUGE_CARD_TMPL.format(
+            heading="😨 <strong>VIX Fear Index</strong>",
+            color=vix_color,
+            headline=f"Current VIX: {current_vix:.2f}" if current_vix else "Current VIX: N/A",
+            status=f"Status: {vix.get('sentiment', 'Unknown')}",
+            interpretation=vix.get('interpretation', 'No data')
+        ))
+    
+    if sentiment_data.get('market_breadth'):
+        breadth = sentiment_data['market_breadth']
+        breadth_color = "green" if breadth.get('breadth_score', 50) > 60 else "red" if breadth.get('breadth_score', 50) < 40 else "orange"
+        
+        gauge_cards.append(_SENTIMENT_GAUGE_CARD_TMPL.format(
+            heading="📊 <strong>Market Breadth</strong>",
+            color=breadth_color,
+            headline=f"Breadth Score: {breadth.get('breadth_score', 50):.1f}",
+            status="Market Health",
+            interpretation=breadth.get('interpretation', 'No data')
+        ))
+    
+    if gauge_cards:
+        render_html_grid(gauge_cards, columns=2)
     
     st.markdown("---")
     
@@ -3874,6 +4198,10 @@ def display_market_sentiment(sentiment_data, symbol):
         Extreme sentiment readings can persist longer than expected in strong trends.
         """)
 
+# Wave numbers by their position in the five-wave cycle; degree marks such as '(3)' are stripped before matching
+_IMPULSE_WAVE_NUMBERS = frozenset({'1', '3', '5'})
+_CORRECTIVE_WAVE_NUMBERS = frozenset({'2', '4'})
+
 def integrate_sentiment_with_waves(analysis, sentiment_data, ticker):
     """
     Integrate market sentiment analysis with Elliott Wave patterns
@@ -3892,15 +4220,16 @@ def integrate_sentiment_with_waves(analysis, sentiment_data, ticker):
     }
     
     # Get current wave analysis
-    primary_count = analysis.get('primary_count', {})
-    current_wave = primary_count.get('current_wave', 'Unknown')
+    current_wave = current_wave_label(analysis.get('primary_count'))
     wave_confidence = analysis.get('confidence_metrics', {}).get('overall_confidence', 0)
     
+    wave_number = current_wave.strip(' ()')
+    
     score = integration['sentiment_score']
     sentiment = integration['sentiment_label']
     
     # Analyze sentiment-wave alignment
-    if "1" in str(current_wave) or "3" in str(current_wave) or "5" in str(current_wave):
+    if wave_number in _IMPULSE_WAVE_NUMBERS:
         # Impulse waves - bullish waves
         if score >= 60:  # Greed/Extreme Greed
             integration['wave_sentiment_alignment'] = {
@@ -3934,7 +4263,7 @@ def integrate_sentiment_with_waves(analysis, sentiment_data, ticker):
                 'confidence_boost': 5
             }
     
-    elif "2" in str(current_wave) or "4" in str(current_wave):
+    elif wave_number in _CORRECTIVE_WAVE_NUMBERS:
         # Corrective waves - expect pullbacks
         if score <= 40:  # Fear/Extreme Fear
             integration['wave_sentiment_alignment'] = {
@@ -4206,7 +4535,7 @@ class AlertSystem:
                         'type': 'PRICE_TARGET',
                         'priority': 'HIGH',
                         'title': f'Price Target Approached - {ticker}',
-                        'message': f'{target_name.replace("_", " ").title()} target ${target_price:.2f} is within {distance_percent:.1f}% (Current: ${current_price:.2f})',
+                        'message': f'{humanize_key(target_name)} target ${target_price:.2f} is within {distance_percent:.1f}% (Current: ${current_price:.2f})',
                         'recommendation': f'Consider taking profits or adjusting positions. Target confidence: {confidence:.1f}%',
                         'timestamp': datetime.now(),
                         'ticker': ticker,
@@ -4633,7 +4962,7 @@ def display_alert_history():
         st.markdown(f"""
         <div style="background: #1e1e1e; border-radius: 8px; padding: 15px; margin: 10px 0; 
                     border-left: 4px solid {accuracy_color};">
-            <h5 style="color: white; margin: 0;">{alert_type.replace('_', ' ').title()}</h5>
+            <h5 style="color: white; margin: 0;">{humanize_key(alert_type)}</h5>
             <p style="color: {accuracy_color}; margin: 5px 0;">
                 Accuracy: {performance['accuracy']:.1%} | Count: {performance['count']} alerts
             </p>